@@ -0,0 +1,101 @@
+import pickle
+import random
+
+import checkersai.board
+import checkersai.game
+
+from common import fixed_positions, measure, random_game, size_name
+
+
+def run(args) -> dict:
+    results = {}
+    # The piece and team properties are read in the innermost loops of move
+    # generation and drawing.
+    values = list(checkersai.board.BoardValue) * 20
+    teams = list(checkersai.board.Team) * 50
+    pieces = [value for value in values if value.team is not None]
+    results["board.value_team"] = measure(
+        lambda: [value.team for value in values],
+        number=args.scale * 100,
+        repeat=args.repeat,
+        ops=len(values),
+    )
+    results["board.value_king"] = measure(
+        lambda: [value.king for value in values],
+        number=args.scale * 100,
+        repeat=args.repeat,
+        ops=len(values),
+    )
+    results["board.value_kinged"] = measure(
+        lambda: [value.kinged for value in pieces if not value.king],
+        number=args.scale * 100,
+        repeat=args.repeat,
+        ops=len(values) // 5 * 2,
+    )
+    results["board.team_direction"] = measure(
+        lambda: [team.direction for team in teams],
+        number=args.scale * 100,
+        repeat=args.repeat,
+        ops=len(teams),
+    )
+    results["board.team_other"] = measure(
+        lambda: [team.other for team in teams],
+        number=args.scale * 100,
+        repeat=args.repeat,
+        ops=len(teams),
+    )
+
+    for size in args.board_size:
+        name = size_name(size)
+
+        results[f"board.construct[{name}]"] = measure(
+            lambda: checkersai.board.Board(size=size),
+            number=args.scale * 20,
+            repeat=args.repeat,
+        )
+
+        board = checkersai.board.Board(size=size)
+        results[f"board.items[{name}]"] = measure(
+            lambda: sum(1 for _ in board.items()),
+            number=args.scale * 20,
+            repeat=args.repeat,
+        )
+
+        board, team = fixed_positions(size)["midgame"]
+        results[f"board.snapshot[{name}]"] = measure(
+            lambda: checkersai.game.PlayerBoard(board),
+            number=args.scale * 20,
+            repeat=args.repeat,
+        )
+        results[f"board.pickle[{name}]"] = measure(
+            lambda: pickle.loads(pickle.dumps(checkersai.game.PlayerBoard(board))),
+            number=args.scale * 20,
+            repeat=args.repeat,
+        )
+
+        for position, (board, team) in fixed_positions(size).items():
+            results[f"board.possible_moves[{name},{position}]"] = measure(
+                lambda: list(board.possible_moves(team)),
+                number=args.scale,
+                repeat=args.repeat,
+            )
+            results[f"board.possible_turns[{name},{position}]"] = measure(
+                lambda: list(board.possible_turns(team)),
+                number=args.scale,
+                repeat=args.repeat,
+            )
+
+        moves = random_game(size, random.Random(0))
+
+        def replay():
+            board = checkersai.board.Board(size=size)
+            for move in moves:
+                board.perform_move(move)
+
+        results[f"board.perform_move[{name}]"] = measure(
+            replay,
+            repeat=args.repeat,
+            ops=len(moves),
+            setup=checkersai.board.move_cache.clear,
+        )
+    return results
@@ -0,0 +1,23 @@
+import random
+
+import checkersai.board
+
+from common import measure, random_game, size_name
+
+
+def run(args) -> dict:
+    results = {}
+    for size in args.board_size:
+        seeds = range(args.games)
+        plies = []
+
+        def play():
+            plies[:] = [len(random_game(size, random.Random(seed))) for seed in seeds]
+
+        result = measure(
+            play, repeat=args.repeat, setup=checkersai.board.move_cache.clear
+        )
+        result["ops"] = sum(plies)
+        result["per_op"] = result["best"] / result["ops"]
+        results[f"games.random_vs_random[{size_name(size)}]"] = result
+    return results
@@ -0,0 +1,97 @@
+import itertools
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.graphics
+
+from common import fixed_positions, measure, size_name
+
+
+def run(args) -> dict:
+    results = {}
+    for size in args.board_size:
+        gui = checkersai.graphics.Graphics(
+            screen_height=800, board_height=720, screen_width=800, board_size=size
+        )
+        players = {
+            team: checkersai.computeropponent.RandomOpponent(team, gui)
+            for team in checkersai.board.Team
+        }
+        for position, (board, team) in fixed_positions(size).items():
+            data = checkersai.game.GameData(
+                players=players, current_team=team, board=board
+            )
+
+            def redraw():
+                # Unchanged boards aren't drawn again, so pretend it changed.
+                gui._drawn = None
+                gui.update(data, 0.0)
+
+            results[f"graphics.update[{size_name(size)},{position}]"] = measure(
+                redraw, number=args.scale, repeat=args.repeat
+            )
+
+    # A frame of a 16 board tournament, when every board has a new move and
+    # when only one of them does. 60 fps leaves 16.7ms per frame.
+    boards = 16
+    for size in args.board_size:
+        gui = checkersai.graphics.MultiGraphics(boards=boards)
+        players = {
+            team: checkersai.computeropponent.RandomOpponent(team, gui)
+            for team in checkersai.board.Team
+        }
+        positions = [board for board, team in fixed_positions(size).values()]
+        games = [
+            checkersai.game.GameData(
+                players=players,
+                current_team=checkersai.board.Team.WHITE,
+                board=positions[i % len(positions)],
+            )
+            for i in range(boards)
+        ]
+        frames = itertools.count()
+
+        def move_all():
+            frame = next(frames)
+            for i, data in enumerate(games):
+                data.board = positions[(i + frame) % len(positions)]
+            gui.update_all(games, 0.0)
+
+        def move_one():
+            frame = next(frames)
+            data = games[frame % boards]
+            data.board = positions[frame % len(positions)]
+            gui.update_all(games, 0.0)
+
+        name = f"{boards},{size_name(size)}"
+        results[f"graphics.grid[{name},all]"] = measure(
+            move_all, number=args.scale, repeat=args.repeat
+        )
+        results[f"graphics.grid[{name},one]"] = measure(
+            move_one, number=args.scale * 10, repeat=args.repeat
+        )
+
+    # Thumbnails of every position, drawn and saved as PNG.
+    thumbnails = checkersai.graphics.Thumbnails(size=256)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "board.png")
+        for size in args.board_size:
+            for position, (board, team) in fixed_positions(size).items():
+                name = f"{size_name(size)},{position}"
+                results[f"graphics.thumbnail[{name}]"] = measure(
+                    lambda: thumbnails.render(board),
+                    number=args.scale,
+                    repeat=args.repeat,
+                )
+                results[f"graphics.thumbnail_png[{name}]"] = measure(
+                    lambda: thumbnails.save(board, path),
+                    number=args.scale,
+                    repeat=args.repeat,
+                )
+    return results
@@ -0,0 +1,75 @@
+import random
+
+import checkersai.board
+import checkersai.rules
+
+from common import fixed_positions, measure, random_game, size_name
+
+
+def check_identical(board: checkersai.board.Board, where: str) -> None:
+    for team in checkersai.board.Team:
+        reference = list(board._reference_moves(team))
+        core = list(board._core_moves(team))
+        if reference != core:
+            raise AssertionError(
+                "Move generators disagree at %s for %s:\n%s\nreference: %s\ncore: %s"
+                % (where, team.name, board, reference, core)
+            )
+
+
+def verify(size: tuple[int, int], games: int) -> None:
+    for position, (board, team) in fixed_positions(size).items():
+        check_identical(board, position)
+    for seed in range(games):
+        board = checkersai.board.Board(size=size)
+        for ply, move in enumerate(random_game(size, random.Random(seed))):
+            check_identical(board, "game %d ply %d" % (seed, ply))
+            board.perform_move(move)
+        check_identical(board, "game %d end" % seed)
+
+
+def run(args) -> dict:
+    print("accelerated core:", checkersai.board.ACCELERATED)
+    results = {}
+    for size in args.board_size:
+        name = size_name(size)
+        verify(size, args.games)
+
+        for position, (board, team) in fixed_positions(size).items():
+            for impl in ("reference", "core"):
+                generate = getattr(board, "_%s_moves" % impl)
+                results[f"movegen.{impl}[{name},{position}]"] = measure(
+                    lambda: list(generate(team)),
+                    number=args.scale,
+                    repeat=args.repeat,
+                )
+
+        board = checkersai.board.Board(size=size)
+        depth = args.perft_depth
+        nodes = board.perft(checkersai.board.Team.WHITE, depth)
+        results[f"movegen.perft{depth}[{name}]"] = measure(
+            lambda: board.perft(checkersai.board.Team.WHITE, depth),
+            repeat=args.repeat,
+            ops=nodes,
+        )
+
+        for rules in checkersai.rules.variants.values():
+            if rules.name == "english":
+                continue
+            for position, (board, team) in fixed_positions(size).items():
+                board = checkersai.board.Board.from_string(board.to_string(), rules)
+                results[f"movegen.{rules.name}[{name},{position}]"] = measure(
+                    lambda: rules.generate_moves(board, team),
+                    number=args.scale,
+                    repeat=args.repeat,
+                )
+
+            board = checkersai.board.Board(size=size, rules=rules)
+            nodes = board.perft(checkersai.board.Team.WHITE, depth)
+            results[f"movegen.{rules.name}.perft{depth}[{name}]"] = measure(
+                lambda: board.perft(checkersai.board.Team.WHITE, depth),
+                repeat=args.repeat,
+                ops=nodes,
+                setup=checkersai.board.move_cache.clear,
+            )
+    return results
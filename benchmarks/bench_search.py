@@ -0,0 +1,53 @@
+import checkersai.board
+import checkersai.evaluation
+import checkersai.ordering
+import checkersai.search
+
+from common import fixed_positions, measure, size_name
+
+
+class Unordered(checkersai.ordering.MoveOrdering):
+    # The baseline: turns are searched in the order the board generates them,
+    # so the node counts show what move ordering saves.
+    def order(self, turns, table_turn, ply):
+        return turns
+
+    def cutoff(self, turn, depth, ply):
+        pass
+
+
+ORDERINGS = {
+    "alphabeta": checkersai.ordering.MoveOrdering,
+    "alphabeta-unordered": Unordered,
+}
+
+
+def run(args) -> dict:
+    results = {}
+    evaluator = checkersai.evaluation.LinearEvaluator()
+    depth = args.search_depth
+    for size in args.board_size:
+        name = size_name(size)
+        for position in ("opening", "early", "midgame"):
+            board, team = fixed_positions(size)[position]
+            for label, ordering in ORDERINGS.items():
+                # A new engine each time, so nothing is left in its tables.
+                # The last one is dropped before making the next, so only one
+                # set of tables is alive at a time; the final one gives the
+                # node count.
+                engine = None
+
+                def search():
+                    nonlocal engine
+                    engine = None
+                    engine = checkersai.search.AlphaBeta(
+                        evaluator, depth, ordering=ordering()
+                    )
+                    engine.search(board, team)
+
+                result = measure(
+                    search, repeat=args.repeat, setup=checkersai.board.move_cache.clear
+                )
+                result["nodes"] = engine.nodes
+                results[f"search.{label}{depth}[{name},{position}]"] = result
+    return results
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+
+import checkersai.board
+import checkersai.rules
+
+DEFAULT_BOARD_SIZES = ((8, 8), (10, 10), (12, 12), (20, 20))
+
+
+def measure(
+    func, *, number: int = 1, repeat: int = 5, ops: int = 1, setup=None
+) -> dict:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t_start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - t_start) / number)
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "per_op": min(timings) / ops,
+        "ops": ops,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def size_name(size: tuple[int, int]) -> str:
+    return "%dx%d" % tuple(size)
+
+
+def sorted_moves(board: checkersai.board.Board, team: checkersai.board.Team):
+    return sorted(
+        board.possible_moves(team), key=lambda move: (move.start_pos, move.end_pos)
+    )
+
+
+def random_game(
+    size: tuple[int, int],
+    rng: random.Random,
+    max_plies: int = 2000,
+    rules: checkersai.rules.Rules | None = None,
+) -> list[checkersai.board.Move]:
+    # Moves are sorted before choosing so that the sequence only depends on the
+    # seed, not on the order in which the board happens to generate them.
+    board = checkersai.board.Board(size=size, rules=rules)
+    team = checkersai.board.Team.WHITE
+    moves = []
+    while len(moves) < max_plies:
+        candidates = sorted_moves(board, team)
+        if not candidates:
+            break
+        move = rng.choice(candidates)
+        board.perform_move(move)
+        moves.append(move)
+        if not board.turn_in_progress:
+            team = team.other
+    return moves
+
+
+def empty_board(size: tuple[int, int]) -> checkersai.board.Board:
+    board = checkersai.board.Board(size=size)
+    for pos, value in list(board.items()):
+        board[pos] = checkersai.board.BoardValue.EMPTY
+    return board
+
+
+def fixed_positions(
+    size: tuple[int, int],
+) -> dict[str, tuple[checkersai.board.Board, checkersai.board.Team]]:
+    Team = checkersai.board.Team
+    BoardValue = checkersai.board.BoardValue
+    cols, rows = size
+    positions = {"opening": (checkersai.board.Board(size=size), Team.WHITE)}
+
+    for name, plies in (("early", 10), ("midgame", 40)):
+        board = checkersai.board.Board(size=size)
+        for move in random_game(size, random.Random(plies), max_plies=plies):
+            board.perform_move(move)
+        positions[name] = (board, Team.WHITE if plies % 2 == 0 else Team.BLACK)
+
+    board = empty_board(size)
+    for icol in range(0, cols, 2):
+        board[icol, 1 - icol % 2 + 2] = BoardValue.WHITE_KING
+    for icol in range(1, cols, 4):
+        board[icol, rows - 1 - (icol + rows) % 2] = BoardValue.BLACK_KING
+    positions["kings"] = (board, Team.WHITE)
+
+    board = empty_board(size)
+    board[1, 0] = BoardValue.WHITE_NORMAL
+    for irow in range(1, rows - 1, 2):
+        board[2, irow] = BoardValue.BLACK_NORMAL
+        board[0, irow] = BoardValue.BLACK_NORMAL
+    positions["multijump"] = (board, Team.WHITE)
+    return positions
@@ -0,0 +1,173 @@
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import checkersai
+
+from common import DEFAULT_BOARD_SIZES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+suites = ["board", "movegen", "search", "graphics", "games"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks/run.py", description="Time checkersai components"
+    )
+    # argparse checks the default of a "*" positional against its choices as
+    # a whole, so the names are checked here instead.
+    parser.add_argument(
+        "suites",
+        nargs="*",
+        metavar="suite",
+        help="Suites to run, from %s. Runs all of them by default." % ", ".join(suites),
+    )
+    parser.add_argument(
+        "--board-size",
+        action="append",
+        nargs=2,
+        type=int,
+        help="Size of the boards to time. 2 args. May be given several times.",
+    )
+    parser.add_argument(
+        "--repeat",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of timed repetitions. The best and median are reported.",
+    )
+    parser.add_argument(
+        "--scale",
+        action="store",
+        type=int,
+        default=10,
+        help="Number of calls per repetition.",
+    )
+    parser.add_argument(
+        "--games",
+        action="store",
+        type=int,
+        default=2,
+        help="Number of full games per repetition for the games suite.",
+    )
+    parser.add_argument(
+        "--perft-depth",
+        action="store",
+        type=int,
+        default=4,
+        help="Depth of the perft runs in the movegen suite.",
+    )
+    parser.add_argument(
+        "--search-depth",
+        action="store",
+        type=int,
+        default=5,
+        help="Depth of the searches in the search suite.",
+    )
+    parser.add_argument(
+        "--filter",
+        action="store",
+        type=str,
+        help="Only report benchmarks whose name contains this string.",
+    )
+    parser.add_argument(
+        "--output",
+        action="store",
+        type=str,
+        default="bench_results.json",
+        help="File to save the results to, as JSON.",
+    )
+    parser.add_argument(
+        "--baseline",
+        action="store",
+        type=str,
+        help="Results file from a previous run to compare against.",
+    )
+    args = parser.parse_args()
+    for suite in args.suites:
+        if suite not in suites:
+            parser.error(
+                "invalid suite %r (choose from %s)" % (suite, ", ".join(suites))
+            )
+    if not args.suites:
+        args.suites = suites
+    if args.board_size is None:
+        args.board_size = [list(size) for size in DEFAULT_BOARD_SIZES]
+    return args
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print()
+    print("%-60s %12s %12s %8s" % ("benchmark", "baseline", "current", "ratio"))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["per_op"]
+        after = result["per_op"]
+        print(
+            "%-60s %10.3fus %10.3fus %7.2fx"
+            % (name, before * 1e6, after * 1e6, before / after if after else 0.0)
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    args.output = os.path.abspath(args.output)
+    if args.baseline is not None:
+        args.baseline = os.path.abspath(args.baseline)
+
+    # Graphics loads its sprites relative to the working directory.
+    os.chdir(ROOT)
+
+    results = {}
+    for suite in dict.fromkeys(args.suites):
+        module = importlib.import_module("bench_" + suite)
+        for name, result in module.run(args).items():
+            if args.filter is not None and args.filter not in name:
+                continue
+            results[name] = result
+            line = "%-60s %12.3fus/op" % (name, result["per_op"] * 1e6)
+            if "nodes" in result:
+                line += " %10d nodes" % result["nodes"]
+            print(line, flush=True)
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "version": checkersai.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
+import os
+
 import setuptools
 import versioneer
 
+ext_modules = []
+if os.environ.get("CHECKERSAI_MYPYC", "0") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["src/checkersai/_core.py"], opt_level="3")
+
 setuptools.setup(
     version=versioneer.get_version(),
-    cmdclass=versioneer.get_cmdclass()
+    cmdclass=versioneer.get_cmdclass(),
+    ext_modules=ext_modules,
 )
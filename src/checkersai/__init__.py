@@ -1,3 +1,9 @@
-from . import _version
+def __getattr__(name: str):
+    # Working the version out may run git, so it is only done when asked for.
+    if name == "__version__":
+        from . import _version
 
-__version__ = _version.get_versions()["version"]
+        version = _version.get_versions()["version"]
+        globals()["__version__"] = version
+        return version
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,8 +1,11 @@
 import argparse
+import asyncio
+import collections
+import concurrent.futures
 import datetime
 import json
 import logging
-import random
+import os
 
 import checkersai
 import checkersai.board
@@ -10,12 +13,15 @@ import checkersai.humanplayer
 import checkersai.game
 import checkersai.graphics
 import checkersai.computeropponent
+import checkersai.rng
+import checkersai.rules
 
 logger = logging.getLogger("checkersai")
 
 available_players = {
     "human": checkersai.humanplayer.HumanPlayer,
     "random": checkersai.computeropponent.RandomOpponent,
+    "search": checkersai.computeropponent.SearchOpponent,
 }
 
 
@@ -24,7 +30,32 @@ def parse_args() -> argparse.Namespace:
         prog="checkersai", description="Play checkers vs the computer"
     )
     parser.add_argument("--version", action="version", version=checkersai.__version__)
-    parser.add_argument("--board-size", action="store", nargs=2, type=int, default=(8, 8), help="Size of the board. 2 args.")
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=modes,
+        default="play",
+        help=(
+            "play a game locally, serve games over the network, record self-play"
+            " games, tune the evaluation weights or train the value network on"
+            " them, analyse a position, replay a recorded game, watch a"
+            " tournament of several games at once or draw the final position of"
+            " every recorded game as a thumbnail."
+        ),
+    )
+    parser.add_argument(
+        "--board-size",
+        action="store",
+        nargs=2,
+        type=int,
+        help="Size of the board. 2 args. Defaults to the variant's usual size.",
+    )
+    parser.add_argument(
+        "--variant",
+        choices=checkersai.rules.variants,
+        default="english",
+        help="Rules to play by.",
+    )
     parser.add_argument(
         "--white",
         choices=available_players,
@@ -37,11 +68,212 @@ def parse_args() -> argparse.Namespace:
         default="random",
         help="Sets which player is black. Black always goes second.",
     )
+    parser.add_argument(
+        "--boards",
+        action="store",
+        type=int,
+        default=16,
+        help="Number of games played side by side in tournament mode.",
+    )
+    parser.add_argument(
+        "--draw-turns",
+        action="store",
+        type=int,
+        default=80,
+        help="Declare a draw after this many turns without a capture.",
+    )
+    parser.add_argument(
+        "--clock",
+        action="store",
+        nargs=2,
+        type=float,
+        metavar=("SECONDS", "INCREMENT"),
+        help=(
+            "Give each side a clock in play mode, with time added after every"
+            " turn. Running out of time loses."
+        ),
+    )
+    parser.add_argument(
+        "--auto-forced",
+        action="store_true",
+        help="Play moves that are the only legal move automatically.",
+    )
+    parser.add_argument(
+        "--max-fps",
+        action="store",
+        type=float,
+        default=60.0,
+        help="Draw at most this many frames a second. 0 draws after every step.",
+    )
+    parser.add_argument(
+        "--adaptive-fps",
+        action="store_true",
+        help="Skip frames while the game can't keep up, e.g. with many engines.",
+    )
+    parser.add_argument(
+        "--host",
+        action="store",
+        type=str,
+        default="127.0.0.1",
+        help="Address to listen on in serve mode.",
+    )
+    parser.add_argument(
+        "--port",
+        action="store",
+        type=int,
+        default=8765,
+        help="Port to listen on in serve mode.",
+    )
+    parser.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        help="Number of processes running engines in serve mode.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=[
+            name
+            for name, player in available_players.items()
+            if issubclass(player, checkersai.computeropponent.ComputerOpponent)
+        ],
+        default="search",
+        help="Player to analyse the position with in analyse mode.",
+    )
+    parser.add_argument(
+        "--position",
+        action="store",
+        type=str,
+        help="Board string to analyse. Defaults to the starting position.",
+    )
+    parser.add_argument(
+        "--team",
+        choices=[team.name for team in checkersai.board.Team],
+        default="WHITE",
+        help="Side to move in analyse mode.",
+    )
+    parser.add_argument(
+        "--time",
+        action="store",
+        type=float,
+        help=(
+            "Seconds the search player may think for a move. With --clock it"
+            " decides for itself, up to this long."
+        ),
+    )
+    parser.add_argument(
+        "--depth",
+        action="store",
+        type=int,
+        default=4,
+        help="Number of turns the search player looks ahead at most.",
+    )
+    parser.add_argument(
+        "--hash-mb",
+        action="store",
+        type=float,
+        default=32.0,
+        help=(
+            "Memory for search tables in each process, in MB. The search players"
+            " in a process share it equally."
+        ),
+    )
+    parser.add_argument(
+        "--weights",
+        action="store",
+        type=str,
+        help="Evaluation weights for the search player. Written in tune mode.",
+    )
+    parser.add_argument(
+        "--network",
+        action="store",
+        type=str,
+        help=(
+            "Value network for the search player, used instead of the weights."
+            " Written in train mode."
+        ),
+    )
+    parser.add_argument(
+        "--hidden",
+        action="store",
+        type=int,
+        default=64,
+        help="Size of the value network's hidden layer in train mode.",
+    )
+    parser.add_argument(
+        "--data",
+        action="store",
+        type=str,
+        default="selfplay.jsonl",
+        help="Self-play games file, appended to in selfplay mode.",
+    )
+    parser.add_argument(
+        "--game",
+        action="store",
+        type=int,
+        default=0,
+        help="Number of the game in the games file to replay, from 0.",
+    )
+    parser.add_argument(
+        "--move",
+        action="store",
+        type=int,
+        default=0,
+        help="Turn to start the replay from, from 0.",
+    )
+    parser.add_argument(
+        "--thumbnail-dir",
+        action="store",
+        type=str,
+        default="thumbnails",
+        help="Directory to write images to in thumbnails mode.",
+    )
+    parser.add_argument(
+        "--thumbnail-size",
+        action="store",
+        type=int,
+        default=256,
+        help="Size of the images in thumbnails mode, in pixels.",
+    )
+    parser.add_argument(
+        "--snapshot-interval",
+        action="store",
+        type=int,
+        default=1,
+        help=(
+            "Record the position every this many turns in selfplay mode. Fewer"
+            " make smaller files but slower seeking."
+        ),
+    )
+    parser.add_argument(
+        "--games",
+        action="store",
+        type=int,
+        default=100,
+        help="Number of games to play in selfplay mode.",
+    )
+    parser.add_argument(
+        "--epochs",
+        action="store",
+        type=int,
+        default=20,
+        help="Passes over the data in tune and train modes.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        action="store",
+        type=int,
+        default=1024,
+        help="Positions per gradient step in tune and train modes.",
+    )
     parser.add_argument(
         "--seed",
         action="store",
         type=int,
-        help="Set the seed for random number generation.",
+        help=(
+            "Set the master seed that every random number stream is derived"
+            " from. Picked at random and logged if not given."
+        ),
     )
     parser.add_argument(
         "--logfile", action="store", type=str, help="Log the run to file. Disabled for multiprocessing."
@@ -67,8 +299,8 @@ def main() -> None:
 
     args = parse_args()
 
-    if args.seed is not None:
-        random.seed(args.seed)
+    if args.seed is None:
+        args.seed = checkersai.rng.master_seed()
 
     if args.logfile is not None:
         handler = logging.FileHandler(args.logfile)
@@ -81,23 +313,302 @@ def main() -> None:
         if val is not None:
             logger.info("%s = %s", arg, str(val))
 
-    play_mode(**vars(args))
+    rules = checkersai.rules.variant(args.variant)
+    if args.board_size is None:
+        args.board_size = rules.default_size
+    modes[args.mode](rules=rules, **vars(args))
     logger.info(
         "Finished execution. Total run time: %s", datetime.datetime.now() - start_time
     )
     logger.info("----------------------------------------------------------------")
 
 
-def play_mode(*, white, black, board_size, **kwargs) -> None:
+def player_options(
+    team: checkersai.board.Team,
+    game: int = 0,
+    /,
+    *,
+    engines: int = 1,
+    seed,
+    depth,
+    weights,
+    network,
+    time,
+    hash_mb,
+    **kwargs,
+) -> dict:
+    return {
+        "random": {"rng": checkersai.rng.stream(seed, "player", game, team.name)},
+        "search": {
+            "depth": depth,
+            "weights": weights,
+            "network": network,
+            "time_limit": time,
+            "hash_mb": hash_mb / engines,
+        },
+    }
+
+
+def play_mode(
+    *,
+    white,
+    black,
+    board_size,
+    draw_turns,
+    clock,
+    auto_forced,
+    max_fps,
+    adaptive_fps,
+    rules,
+    seed,
+    **kwargs,
+) -> None:
     gui = checkersai.graphics.Graphics(
-        screen_height=800, board_height=720, screen_width=800, board_size=board_size
+        screen_height=800,
+        board_height=720,
+        screen_width=800,
+        board_size=board_size,
+        rng=checkersai.rng.stream(seed, "graphics"),
+    )
+    engines = max((white, black).count("search"), 1)
+    white_player = available_players[white](
+        checkersai.board.Team.WHITE,
+        gui,
+        **player_options(
+            checkersai.board.Team.WHITE, engines=engines, seed=seed, **kwargs
+        ).get(white, {}),
+    )
+    black_player = available_players[black](
+        checkersai.board.Team.BLACK,
+        gui,
+        **player_options(
+            checkersai.board.Team.BLACK, engines=engines, seed=seed, **kwargs
+        ).get(black, {}),
     )
-    white_player = available_players[white](checkersai.board.Team.WHITE, gui)
-    black_player = available_players[black](checkersai.board.Team.BLACK, gui)
     start_team = checkersai.board.Team.WHITE
 
-    game = checkersai.game.Game(gui, datetime.timedelta(milliseconds=16.67), board_size)
+    game = checkersai.game.Game(
+        gui,
+        datetime.timedelta(milliseconds=16.67),
+        board_size,
+        draw_turns,
+        rules,
+        None if clock is None else tuple(clock),
+        auto_forced,
+        max_fps,
+        adaptive_fps,
+    )
     game.start_game(white_player, black_player, start_team)
 
 
-main()
\ No newline at end of file
+def serve_mode(
+    *, host, port, workers, board_size, draw_turns, auto_forced, rules, **kwargs
+) -> None:
+    import checkersai.server
+
+    # Engines always play black, and each worker keeps one of each.
+    options = player_options(checkersai.board.Team.BLACK, **kwargs)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        server = checkersai.server.GameServer(
+            board_size=board_size,
+            max_turns_without_capture=draw_turns,
+            rules=rules,
+            executor=executor,
+            auto_forced_moves=auto_forced,
+            engine_options={"search": options["search"]},
+        )
+        try:
+            asyncio.run(server.serve(host, port))
+        except KeyboardInterrupt:
+            pass
+
+
+def selfplay_mode(
+    *,
+    data,
+    games,
+    workers,
+    board_size,
+    variant,
+    depth,
+    weights,
+    network,
+    hash_mb,
+    draw_turns,
+    snapshot_interval,
+    seed,
+    **kwargs,
+) -> None:
+    import checkersai.selfplay
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        checkersai.selfplay.write_games(
+            data,
+            games,
+            executor,
+            seed=seed,
+            board_size=tuple(board_size),
+            variant=variant,
+            depth=depth,
+            weights=weights,
+            network=network,
+            hash_mb=hash_mb,
+            max_turns_without_capture=draw_turns,
+            snapshot_interval=snapshot_interval,
+        )
+
+
+def tune_mode(*, data, weights, workers, epochs, batch_size, seed, **kwargs) -> None:
+    import checkersai.evaluation
+    import checkersai.tuning
+
+    workers = workers or os.cpu_count()
+    cache_path = data + ".features"
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        checkersai.tuning.extract(data, cache_path, executor)
+        tuned = checkersai.tuning.fit(
+            cache_path,
+            executor,
+            epochs=epochs,
+            batch_size=batch_size,
+            seed=seed,
+        )
+    checkersai.evaluation.LinearEvaluator(tuned).save(weights or "weights.json")
+
+
+def train_mode(
+    *, data, network, board_size, hidden, workers, epochs, batch_size, seed, **kwargs
+) -> None:
+    import numpy as np
+
+    import checkersai.network
+    import checkersai.tuning
+
+    inputs = checkersai.network.PLANES * board_size[0] * board_size[1]
+    cache_path = data + ".planes"
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        checkersai.tuning.extract(
+            data,
+            cache_path,
+            executor,
+            rows=checkersai.network.position_rows,
+            columns=inputs + 1,
+        )
+    model = checkersai.network.ValueNetwork.create(
+        inputs, hidden, np.random.default_rng(seed)
+    )
+    checkersai.network.train(
+        cache_path, model, epochs=epochs, batch_size=batch_size, seed=seed
+    )
+    model.save(network or "network.npz")
+
+
+def analyse_mode(*, position, team, engine, board_size, rules, **kwargs) -> None:
+    import checkersai.analysis
+
+    if position is None:
+        board = checkersai.board.Board(size=board_size, rules=rules)
+    else:
+        board = checkersai.board.Board.from_string(position, rules)
+    team = checkersai.board.Team[team]
+    player = available_players[engine](
+        team, None, **player_options(team, **kwargs).get(engine, {})
+    )
+    checkersai.analysis.analyse(board, team, player)
+
+
+def replay_mode(*, data, game, move, draw_turns, seed, **kwargs) -> None:
+    import checkersai.archive
+    import checkersai.replay
+
+    record = checkersai.archive.Archive(data)[game]
+    board, team = checkersai.archive.position(record, move)
+    gui = checkersai.graphics.Graphics(
+        screen_height=800,
+        board_height=720,
+        screen_width=800,
+        board_size=(board.cols, board.rows),
+        rng=checkersai.rng.stream(seed, "graphics"),
+    )
+    checkersai.replay.replay(gui, record, move, max_turns_without_capture=draw_turns)
+
+
+def tournament_mode(
+    *,
+    white,
+    black,
+    boards,
+    draw_turns,
+    auto_forced,
+    max_fps,
+    adaptive_fps,
+    rules,
+    board_size,
+    **kwargs,
+) -> None:
+    if "human" in (white, black):
+        raise ValueError("Tournaments are for computer players only.")
+    gui = checkersai.graphics.MultiGraphics(
+        boards=boards, rng=checkersai.rng.stream(kwargs["seed"], "graphics")
+    )
+    engines = max(boards * (white, black).count("search"), 1)
+    matches = [
+        tuple(
+            available_players[name](
+                team,
+                gui,
+                **player_options(team, game, engines=engines, **kwargs).get(name, {}),
+            )
+            for name, team in (
+                (white, checkersai.board.Team.WHITE),
+                (black, checkersai.board.Team.BLACK),
+            )
+        )
+        for game in range(boards)
+    ]
+    game = checkersai.game.Game(
+        gui,
+        datetime.timedelta(milliseconds=16.67),
+        board_size,
+        draw_turns,
+        rules,
+        auto_forced_moves=auto_forced,
+        max_fps=max_fps,
+        adaptive_fps=adaptive_fps,
+    )
+    games = game.start_games(matches, checkersai.board.Team.WHITE)
+    results = collections.Counter(
+        "DRAW" if data.winner is None else data.winner.name for data in games
+    )
+    print(
+        "WHITE %d, BLACK %d, DRAW %d"
+        % (results["WHITE"], results["BLACK"], results["DRAW"])
+    )
+
+
+def thumbnails_mode(
+    *, data, thumbnail_dir, thumbnail_size, workers, seed, **kwargs
+) -> None:
+    import checkersai.thumbnails
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        checkersai.thumbnails.write_thumbnails(
+            data, thumbnail_dir, executor, size=thumbnail_size, seed=seed
+        )
+
+
+modes = {
+    "play": play_mode,
+    "serve": serve_mode,
+    "selfplay": selfplay_mode,
+    "tune": tune_mode,
+    "train": train_mode,
+    "analyse": analyse_mode,
+    "replay": replay_mode,
+    "tournament": tournament_mode,
+    "thumbnails": thumbnails_mode,
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Move generation over a flat list of cells, one int per square in row-major
+# order: -1 for light squares, otherwise the BoardValue's value. This module
+# is plain Python so it can be compiled with mypyc (see setup.py); keep it
+# free of imports from the rest of the package and fully annotated.
+# make_move and unmake_move only serve perft here: Board makes its own moves,
+# since it keeps its piece index and hash up to date as well as the cells.
+# tests/test_core.py checks all of it against the reference implementation.
+from typing import Final
+
+EMPTY: Final = 0
+WHITE_NORMAL: Final = 1
+BLACK_NORMAL: Final = 2
+WHITE_KING: Final = 3
+
+WHITE: Final = 0
+BLACK: Final = 1
+
+DIRECTIONS: Final = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def team_of(value: int) -> int:
+    if value <= EMPTY:
+        return -1
+    return (value - 1) % 2
+
+
+def generate_moves(
+    cells: list[int],
+    cols: int,
+    rows: int,
+    origins: list[int],
+    team: int,
+    forced: int,
+) -> list[tuple[int, int]]:
+    if forced >= 0:
+        origins = [forced] if team_of(cells[forced]) == team else []
+
+    moves: list[tuple[int, int]] = []
+    for start in origins:
+        add_captures(cells, cols, rows, start, moves)
+    if moves:
+        return moves
+
+    direction = 1 if team == WHITE else -1
+    for start in origins:
+        x = start % cols
+        y = start // cols
+        king = cells[start] >= WHITE_KING
+        for dx, dy in DIRECTIONS:
+            if not king and dy != direction:
+                continue
+            end_x = x + dx
+            end_y = y + dy
+            if 0 <= end_x < cols and 0 <= end_y < rows:
+                end = end_y * cols + end_x
+                if cells[end] == EMPTY:
+                    moves.append((start, end))
+    return moves
+
+
+def add_captures(
+    cells: list[int], cols: int, rows: int, start: int, moves: list[tuple[int, int]]
+) -> None:
+    value = cells[start]
+    team = team_of(value)
+    direction = 1 if team == WHITE else -1
+    king = value >= WHITE_KING
+    x = start % cols
+    y = start // cols
+    for dx, dy in DIRECTIONS:
+        if not king and dy != direction:
+            continue
+        end_x = x + 2 * dx
+        end_y = y + 2 * dy
+        if 0 <= end_x < cols and 0 <= end_y < rows:
+            end = end_y * cols + end_x
+            jumped = cells[(y + dy) * cols + x + dx]
+            if cells[end] == EMPTY and team_of(jumped) == 1 - team:
+                moves.append((start, end))
+
+
+def can_capture_from(cells: list[int], cols: int, rows: int, start: int) -> bool:
+    moves: list[tuple[int, int]] = []
+    add_captures(cells, cols, rows, start, moves)
+    return len(moves) > 0
+
+
+def make_move(cells: list[int], cols: int, rows: int, start: int, end: int) -> int:
+    value = cells[start]
+    captured = EMPTY
+    start_y = start // cols
+    end_y = end // cols
+    if abs(end_y - start_y) == 2:
+        jumped = (start_y + end_y) // 2 * cols + (start % cols + end % cols) // 2
+        captured = cells[jumped]
+        cells[jumped] = EMPTY
+
+    kinged = 0
+    if value < WHITE_KING:
+        if end_y == (rows - 1 if value == WHITE_NORMAL else 0):
+            value += 2
+            kinged = 1
+
+    cells[end] = value
+    cells[start] = EMPTY
+    return captured | (kinged << 3)
+
+
+def unmake_move(cells: list[int], cols: int, start: int, end: int, undo: int) -> None:
+    value = cells[end]
+    if undo & 8:
+        value -= 2
+    cells[start] = value
+    cells[end] = EMPTY
+
+    captured = undo & 7
+    if captured != EMPTY:
+        start_y = start // cols
+        end_y = end // cols
+        jumped = (start_y + end_y) // 2 * cols + (start % cols + end % cols) // 2
+        cells[jumped] = captured
+
+
+def perft(
+    cells: list[int], cols: int, rows: int, team: int, forced: int, depth: int
+) -> int:
+    if depth == 0:
+        return 1
+
+    origins = [i for i in range(len(cells)) if team_of(cells[i]) == team]
+    moves = generate_moves(cells, cols, rows, origins, team, forced)
+    if depth == 1:
+        return len(moves)
+
+    total = 0
+    for start, end in moves:
+        undo = make_move(cells, cols, rows, start, end)
+        if (
+            (undo & 7) != EMPTY
+            and not (undo & 8)
+            and can_capture_from(cells, cols, rows, end)
+        ):
+            total += perft(cells, cols, rows, team, end, depth - 1)
+        else:
+            total += perft(cells, cols, rows, 1 - team, -1, depth - 1)
+        unmake_move(cells, cols, start, end, undo)
+    return total
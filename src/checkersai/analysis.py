@@ -0,0 +1,46 @@
+import sys
+import typing
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.search
+
+
+def format_info(info: checkersai.search.SearchInfo) -> str:
+    return (
+        "info depth %d score %.3f nodes %d nps %d tthits %.1f%% hashfull %.1f%%"
+        " time %.3f pv %s"
+    ) % (
+        info.depth,
+        info.score,
+        info.nodes,
+        info.nps,
+        100 * info.tt_hit_rate,
+        100 * info.hash_usage,
+        info.seconds,
+        " ".join(checkersai.search.format_turn(turn) for turn in info.pv),
+    )
+
+
+def analyse(
+    board: checkersai.board.Board,
+    team: checkersai.board.Team,
+    engine: checkersai.computeropponent.ComputerOpponent,
+    out: typing.TextIO = sys.stdout,
+) -> checkersai.board.CompoundMove | None:
+    # Engines that search report each iteration as it completes.
+    search = getattr(engine, "search", None)
+    if search is not None:
+        print("info memory %d" % search.nbytes, file=out, flush=True)
+        search.on_iteration = lambda info: print(
+            format_info(info), file=out, flush=True
+        )
+    if not board.can_move(team):
+        print("bestmove none", file=out, flush=True)
+        return None
+    move = engine.next_move(checkersai.game.PlayerBoard(board))
+    if isinstance(move, checkersai.board.Move):
+        move = checkersai.board.CompoundMove((move,))
+    print("bestmove", checkersai.search.format_turn(move), file=out, flush=True)
+    return move
@@ -0,0 +1,117 @@
+import json
+import os
+import re
+import struct
+
+import checkersai.board
+import checkersai.rules
+import checkersai.search
+
+_teams = {"w": checkersai.board.Team.WHITE, "b": checkersai.board.Team.BLACK}
+_offset = struct.Struct("<Q")
+
+
+class Archive:
+    # Games are JSON lines. Next to them, path + ".idx" holds the byte offset
+    # of every game as little-endian 64 bit integers, so any game can be read
+    # with two seeks. An index that is missing or behind the games, e.g. after
+    # games were appended by something else, is brought up to date on open.
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+        if not os.path.exists(path):
+            open(path, "ab").close()
+        self._update_index()
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.index_path) // _offset.size
+
+    def __getitem__(self, number: int) -> dict:
+        if not 0 <= number < len(self):
+            raise IndexError("No game %d in %s." % (number, self.path))
+        with open(self.index_path, "rb") as f:
+            f.seek(number * _offset.size)
+            (offset,) = _offset.unpack(f.read(_offset.size))
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def append(self, game: dict) -> None:
+        with open(self.path, "ab") as f, open(self.index_path, "ab") as index:
+            index.write(_offset.pack(f.tell()))
+            f.write((json.dumps(game) + "\n").encode())
+
+    def _update_index(self) -> None:
+        # Only the part of the file after the last indexed game is scanned.
+        start = 0
+        if os.path.exists(self.index_path) and len(self):
+            with open(self.index_path, "rb") as f:
+                f.seek((len(self) - 1) * _offset.size)
+                (start,) = _offset.unpack(f.read(_offset.size))
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                f.readline()
+                start = f.tell()
+        with open(self.path, "rb") as f, open(self.index_path, "ab") as index:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if line.strip():
+                    index.write(_offset.pack(offset))
+                offset += len(line)
+
+
+def parse_path(text: str) -> tuple[tuple[int, int], ...]:
+    numbers = [int(number) for number in re.split("[-x,]", text)]
+    return tuple(zip(numbers[::2], numbers[1::2]))
+
+
+def find_turn(
+    board: checkersai.board.Board, team: checkersai.board.Team, text: str
+) -> checkersai.board.CompoundMove:
+    path = parse_path(text)
+    for turn in board.possible_turns(team):
+        if turn.path == path:
+            return turn
+    raise ValueError("%s is not a legal turn for %s." % (text, team.name))
+
+
+def position(
+    game: dict, number: int
+) -> tuple[checkersai.board.Board, checkersai.board.Team]:
+    # The board before turn number, from the latest snapshot at or before it.
+    # Games may keep a snapshot every snapshot_interval turns only, so at
+    # most that many turns less one are played through.
+    turns = game["turns"]
+    if not 0 <= number <= len(turns):
+        raise IndexError("The game has %d turns." % len(turns))
+    rules = checkersai.rules.variant(game["variant"])
+    interval = game.get("snapshot_interval", 1)
+    snapshot = min(number // interval, len(game["positions"]) - 1)
+    board = checkersai.board.Board.from_string(game["positions"][snapshot], rules)
+    for i in range(snapshot * interval, number):
+        board.perform_compound_move(
+            find_turn(board, _teams[game["teams"][i]], turns[i])
+        )
+    if number < len(turns):
+        team = _teams[game["teams"][number]]
+    else:
+        team = _teams[game["teams"][-1]].other
+    return board, team
+
+
+def positions(game: dict):
+    # Every position before a turn with the side to move. Games with a
+    # snapshot of every position need no turns, as older ones don't have them.
+    rules = checkersai.rules.variant(game["variant"])
+    interval = game.get("snapshot_interval", 1)
+    board = None
+    for i, char in enumerate(game["teams"]):
+        team = _teams[char]
+        if i % interval == 0:
+            board = checkersai.board.Board.from_string(
+                game["positions"][i // interval], rules
+            )
+        yield board.copy(), team
+        if (i + 1) % interval:
+            board.perform_compound_move(find_turn(board, team, game["turns"][i]))
@@ -1,5 +1,16 @@
+import collections
 import dataclasses
 import enum
+import importlib.machinery
+import random
+import types
+
+import checkersai._core
+import checkersai.rules
+
+ACCELERATED = checkersai._core.__file__.endswith(
+    tuple(importlib.machinery.EXTENSION_SUFFIXES)
+)
 
 
 class InvalidBoardPosition(Exception):
@@ -14,13 +25,16 @@ class Team(enum.Enum):
     WHITE = 0
     BLACK = 1
 
-    @property
-    def direction(self):
-        return 1 if self == Team.WHITE else -1
+    # Plain attributes on each member, set below, since they are read in the
+    # innermost loops.
+    direction: int
+    other: "Team"
 
-    @property
-    def other(self):
-        return Team.WHITE if self == Team.BLACK else Team.BLACK
+
+Team.WHITE.direction = 1
+Team.BLACK.direction = -1
+Team.WHITE.other = Team.BLACK
+Team.BLACK.other = Team.WHITE
 
 
 class BoardValue(enum.Enum):
@@ -30,94 +44,281 @@ class BoardValue(enum.Enum):
     WHITE_KING = 3
     BLACK_KING = 4
 
-    @property
-    def team(self) -> Team:
-        if self == BoardValue.EMPTY:
-            return None
-        elif self == BoardValue.WHITE_NORMAL or self == BoardValue.WHITE_KING:
-            return Team.WHITE
-        else:
-            return Team.BLACK
-
-    @property
-    def king(self) -> bool:
-        return self == BoardValue.WHITE_KING or self == BoardValue.BLACK_KING
+    team: Team | None
+    king: bool
 
     @property
     def kinged(self) -> "BoardValue":
-        if self == BoardValue.WHITE_NORMAL:
-            return BoardValue.WHITE_KING
-        elif self == BoardValue.BLACK_NORMAL:
-            return BoardValue.BLACK_KING
-        else:
+        kinged = _kinged[self._value_]
+        if kinged is None:
             raise ValueError
+        return kinged
+
+
+for _value, _team, _king in (
+    (BoardValue.EMPTY, None, False),
+    (BoardValue.WHITE_NORMAL, Team.WHITE, False),
+    (BoardValue.BLACK_NORMAL, Team.BLACK, False),
+    (BoardValue.WHITE_KING, Team.WHITE, True),
+    (BoardValue.BLACK_KING, Team.BLACK, True),
+):
+    _value.team = _team
+    _value.king = _king
+_kinged = (
+    None,
+    BoardValue.WHITE_KING,
+    BoardValue.BLACK_KING,
+    None,
+    None,
+)
+
+_value_chars = {
+    BoardValue.EMPTY: ".",
+    BoardValue.WHITE_NORMAL: "w",
+    BoardValue.WHITE_KING: "W",
+    BoardValue.BLACK_NORMAL: "b",
+    BoardValue.BLACK_KING: "B",
+}
+_char_values = {char: value for value, char in _value_chars.items()}
+_values = tuple(BoardValue)
+
+# Zobrist keys, four per square (one per piece value), grown as boards need them.
+_zobrist = []
+_zobrist_rng = random.Random(0x5EED)
+
+
+def _extend_zobrist(squares: int) -> None:
+    while len(_zobrist) < 4 * squares:
+        _zobrist.append(_zobrist_rng.getrandbits(64))
+
+
+class MoveCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: tuple) -> dict | None:
+        return self._entries.get(key)
+
+    def put(self, key: tuple, entry: dict) -> None:
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
 
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
 
-@dataclasses.dataclass
+
+move_cache = MoveCache(maxsize=4096)
+
+
+@dataclasses.dataclass(frozen=True)
 class Move:
     team: Team
     start_pos: tuple[int, int]
     end_pos: tuple[int, int]
+    # Worked out from the step length unless given. Flying kings capture from
+    # a distance, so their moves always say which piece they jump.
+    jump_pos: tuple[int, int] | None = dataclasses.field(default=..., compare=False)
+
+    def __post_init__(self):
+        if self.jump_pos is ...:
+            jump_pos = None
+            if abs(self.end_pos[1] - self.start_pos[1]) == 2:
+                jump_pos = (
+                    (self.end_pos[0] + self.start_pos[0]) // 2,
+                    (self.end_pos[1] + self.start_pos[1]) // 2,
+                )
+            object.__setattr__(self, "jump_pos", jump_pos)
 
     @property
-    def jump_pos(self) -> tuple[int, int] | None:
-        dy = self.end_pos[1] - self.start_pos[1]
+    def is_capture(self):
+        return self.jump_pos is not None
+
 
-        jump = abs(dy) == 2
-        if jump:
-            return tuple((self.end_pos[i] + self.start_pos[i]) // 2 for i in range(2))
-        return None
+@dataclasses.dataclass(frozen=True)
+class CompoundMove:
+    moves: tuple[Move, ...]
 
     @property
-    def is_capture(self):
-        return self.jump_pos is not None
+    def team(self) -> Team:
+        return self.moves[0].team
+
+    @property
+    def start_pos(self) -> tuple[int, int]:
+        return self.moves[0].start_pos
+
+    @property
+    def end_pos(self) -> tuple[int, int]:
+        return self.moves[-1].end_pos
+
+    @property
+    def path(self) -> tuple[tuple[int, int], ...]:
+        return (self.start_pos, *(move.end_pos for move in self.moves))
+
+    @property
+    def captured(self) -> tuple[tuple[int, int], ...]:
+        return tuple(move.jump_pos for move in self.moves if move.is_capture)
+
+    @property
+    def is_capture(self) -> bool:
+        return self.moves[0].is_capture
 
 
 class Board:
-    def __init__(self, *, size: tuple[int, int] = (8, 8)):
+    def __init__(
+        self,
+        *,
+        size: tuple[int, int] = (8, 8),
+        rules: "checkersai.rules.Rules | None" = None,
+    ):
+        if rules is None:
+            rules = checkersai.rules.variants["english"]
         cols, rows = size
         if cols < 3:
             raise ValueError("Cols must be at least 3.")
         if rows < 5:
             raise ValueError("Rows must be at least 5.")
 
+        self._rules = rules
         self._cols = cols
         self._rows = rows
-        self._board = [
-            [
+        start_rows = min(rules.start_rows, (rows - 1) // 2)
+        self._cells = [
+            (
                 (
-                    (
-                        BoardValue.WHITE_NORMAL
-                        if irow < 2
-                        else (
-                            BoardValue.BLACK_NORMAL
-                            if irow > rows - 2 - 1
-                            else BoardValue.EMPTY
-                        )
+                    BoardValue.WHITE_NORMAL.value
+                    if irow < start_rows
+                    else (
+                        BoardValue.BLACK_NORMAL.value
+                        if irow > rows - start_rows - 1
+                        else BoardValue.EMPTY.value
                     )
-                    if (icol + irow) % 2 == 1
-                    else None
                 )
-                for icol in range(cols)
-            ]
+                if (icol + irow) % 2 == 1
+                else -1
+            )
             for irow in range(rows)
+            for icol in range(cols)
         ]
         self._last_move = None
+        self._turn_continues = False
+        # Captured pieces that stay on the board until the turn ends.
+        self._pending = ()
+        self._shared = False
+        self._build_index()
+
+    def _build_index(self) -> None:
+        _extend_zobrist(self._cols * self._rows)
+        self._hash = 0
+        self._pieces = {team: {} for team in Team}
+        self._counts = {value: 0 for value in BoardValue}
+        self._advancement = {team: 0 for team in Team}
+        self._back_rank = {team: 0 for team in Team}
+        cols = self._cols
+        for index, cell in enumerate(self._cells):
+            if cell > 0:
+                self._add((index % cols, index // cols), _values[cell])
+            elif cell == 0:
+                self._counts[BoardValue.EMPTY] += 1
 
     def __getitem__(self, item: tuple[int, int]) -> BoardValue:
         icol, irow = item
         if self.is_legal_position(item):
-            return self._board[irow][icol]
+            return _values[self._cells[irow * self._cols + icol]]
         else:
             raise InvalidBoardPosition
 
     def __setitem__(self, key: tuple[int, int], value: BoardValue) -> None:
         icol, irow = key
         if self.is_legal_position(key):
-            self._board[irow][icol] = value
+            if self._shared:
+                self._unshare()
+            index = irow * self._cols + icol
+            self._remove(key, _values[self._cells[index]])
+            self._add(key, value)
+            self._cells[index] = value.value
         else:
             raise InvalidBoardPosition
 
+    def copy(self) -> "Board":
+        # Copies share their state until one of them is written to.
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        self._shared = board._shared = True
+        return board
+
+    def _unshare(self) -> None:
+        self._cells = list(self._cells)
+        self._pieces = {team: dict(pieces) for team, pieces in self._pieces.items()}
+        self._counts = dict(self._counts)
+        self._advancement = dict(self._advancement)
+        self._back_rank = dict(self._back_rank)
+        self._shared = False
+
+    def __getstate__(self) -> dict:
+        return {
+            "size": (self._cols, self._rows),
+            "cells": bytes(cell + 1 for cell in self._cells),
+            "last_move": self._last_move,
+            "rules": self._rules,
+            "turn_continues": self._turn_continues,
+            "pending": self._pending,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self._cols, self._rows = state["size"]
+        self._cells = [cell - 1 for cell in state["cells"]]
+        self._last_move = state["last_move"]
+        self._rules = state["rules"]
+        self._turn_continues = state["turn_continues"]
+        self._pending = state["pending"]
+        self._shared = False
+        self._build_index()
+
+    def _add(self, pos: tuple[int, int], value: BoardValue) -> None:
+        self._counts[value] += 1
+        team = value.team
+        if team is not None:
+            index = pos[1] * self._cols + pos[0]
+            self._hash ^= _zobrist[4 * index + value.value - 1]
+            self._pieces[team][pos] = value
+            advancement = self._advancement_of(pos, team)
+            self._advancement[team] += advancement
+            if advancement == 0:
+                self._back_rank[team] += 1
+
+    def _remove(self, pos: tuple[int, int], value: BoardValue) -> None:
+        self._counts[value] -= 1
+        team = value.team
+        if team is not None:
+            index = pos[1] * self._cols + pos[0]
+            self._hash ^= _zobrist[4 * index + value.value - 1]
+            del self._pieces[team][pos]
+            advancement = self._advancement_of(pos, team)
+            self._advancement[team] -= advancement
+            if advancement == 0:
+                self._back_rank[team] -= 1
+
+    def _advancement_of(self, pos: tuple[int, int], team: Team) -> int:
+        return pos[1] if team == Team.WHITE else self._rows - 1 - pos[1]
+
     def __str__(self) -> str:
         symb = {
             BoardValue.WHITE_NORMAL: "[w]",
@@ -134,6 +335,68 @@ class Board:
             for y in range(self.rows)
         )
 
+    def to_string(self) -> str:
+        text = "%dx%d:%s" % (
+            self.cols,
+            self.rows,
+            "/".join(
+                "".join(
+                    _value_chars[self[x, y]] for x in range(1 - y % 2, self.cols, 2)
+                )
+                for y in range(self.rows)
+            ),
+        )
+        # Mid-turn, also the piece that has to keep capturing and the pieces
+        # it has already jumped.
+        if self._turn_continues:
+            text += ":%d,%d" % self._last_move.end_pos
+        if self._pending:
+            text += ":" + "/".join(
+                "%d,%d" % (index % self._cols, index // self._cols)
+                for index in self._pending
+            )
+        return text
+
+    @classmethod
+    def from_string(
+        cls, text: str, rules: "checkersai.rules.Rules | None" = None
+    ) -> "Board":
+        try:
+            size, squares, *turn = text.strip().split(":")
+            if len(turn) > 2:
+                raise ValueError("Too many fields.")
+            cols, rows = (int(n) for n in size.split("x"))
+            board = cls(size=(cols, rows), rules=rules)
+            lines = squares.split("/")
+            if len(lines) != rows:
+                raise ValueError("Expected %d rows." % rows)
+            for y, line in enumerate(lines):
+                xs = range(1 - y % 2, cols, 2)
+                if len(line) != len(xs):
+                    raise ValueError("Expected %d squares in row %d." % (len(xs), y))
+                for x, char in zip(xs, line):
+                    board[x, y] = _char_values[char]
+            if turn:
+                # Only where the last move ended matters for what follows.
+                pos = tuple(int(n) for n in turn[0].split(","))
+                team = board[pos].team
+                if team is None:
+                    raise ValueError("No piece to continue the turn with.")
+                board._last_move = Move(
+                    team=team, start_pos=pos, end_pos=pos, jump_pos=None
+                )
+                board._turn_continues = True
+            if len(turn) == 2:
+                board._pending = tuple(
+                    y * cols + x
+                    for x, y in (
+                        (int(n) for n in item.split(",")) for item in turn[1].split("/")
+                    )
+                )
+        except (KeyError, ValueError, InvalidBoardPosition) as e:
+            raise ValueError("Invalid board string %r." % text) from e
+        return board
+
     def items(self):
         for irow in range(self.rows):
             for icol in range(self.cols):
@@ -141,6 +404,20 @@ class Board:
                 if self.is_legal_position(pos):
                     yield pos, self[pos]
 
+    def pieces(self, team: Team | None = None):
+        teams = Team if team is None else (team,)
+        for team in teams:
+            for item in tuple(self._pieces[team].items()):
+                yield item
+
+    @property
+    def rules(self) -> "checkersai.rules.Rules":
+        return self._rules
+
+    @property
+    def turn_in_progress(self) -> bool:
+        return self._turn_continues
+
     @property
     def rows(self) -> int:
         return self._rows
@@ -149,31 +426,107 @@ class Board:
     def cols(self) -> int:
         return self._cols
 
+    @property
+    def piece_counts(self) -> types.MappingProxyType:
+        return types.MappingProxyType(self._counts)
+
+    @property
+    def advancement(self) -> types.MappingProxyType:
+        return types.MappingProxyType(self._advancement)
+
+    @property
+    def back_rank_occupancy(self) -> types.MappingProxyType:
+        return types.MappingProxyType(self._back_rank)
+
+    @property
+    def position_hash(self) -> int:
+        return self._hash
+
+    def num_pieces(self, team: Team) -> int:
+        return len(self._pieces[team])
+
     def can_move(self, team: Team) -> bool:
-        for move in self.possible_moves(team):
-            return True
-        return False
+        if not self._pieces[team]:
+            return False
+        return len(self._legal_moves(team)) > 0
 
     def possible_moves(self, team: Team):
-        move_differences = (
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
-            (-2, -2),
-            (-2, 2),
-            (2, -2),
-            (2, 2),
+        for move in self._legal_moves(team).values():
+            yield move
+
+    def _cache_key(self, team: Team) -> tuple:
+        # Everything move generation depends on, so a move made on the board
+        # moves it on to a different entry.
+        return (
+            self._rules,
+            self._cols,
+            self._rows,
+            self._hash,
+            team,
+            self._forced_index(team),
+            self._pending,
         )
-        for (start_x, start_y), value in self.items():
-            if value.team == team:
-                for dx, dy in move_differences:
-                    end_x, end_y = start_x + dx, start_y + dy
-                    move = Move(
-                        start_pos=(start_x, start_y), end_pos=(end_x, end_y), team=team
-                    )
-                    if self.is_legal_move(move):
-                        yield move
+
+    def _legal_moves(self, team: Team) -> dict:
+        key = self._cache_key(team)
+        entry = move_cache.get(key)
+        if entry is None:
+            # Generation follows the order pieces were added in, which depends
+            # on the path to the position. Sorted, random picks and search
+            # tie-breaks depend on the position alone.
+            moves = self._rules.generate_moves(self, team)
+            entry = {
+                (move.start_pos, move.end_pos): move
+                for move in sorted(
+                    moves, key=lambda move: (move.start_pos, move.end_pos)
+                )
+            }
+            move_cache.put(key, entry)
+        return entry
+
+    def _core_moves(self, team: Team):
+        cols = self._cols
+        for start, end in checkersai._core.generate_moves(
+            self._cells,
+            cols,
+            self._rows,
+            [x + y * cols for x, y in self._pieces[team]],
+            team.value,
+            self._forced_index(team),
+        ):
+            yield Move(
+                team=team,
+                start_pos=(start % cols, start // cols),
+                end_pos=(end % cols, end // cols),
+            )
+
+    def _reference_moves(self, team: Team):
+        pieces = list(self.pieces(team))
+        if self._forced_index(team) >= 0:
+            pieces = [item for item in pieces if item[0] == self._last_move.end_pos]
+
+        captures = [
+            move for pos, value in pieces for move in self._reference_captures(pos)
+        ]
+        if captures:
+            for move in captures:
+                yield move
+            return
+
+        move_differences = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+        for (start_x, start_y), value in pieces:
+            for dx, dy in move_differences:
+                end_x, end_y = start_x + dx, start_y + dy
+                move = Move(
+                    start_pos=(start_x, start_y), end_pos=(end_x, end_y), team=team
+                )
+                if self._is_legal_step(move):
+                    yield move
+
+    def can_capture(self, team: Team) -> bool:
+        for move in self._legal_moves(team).values():
+            return move.is_capture
+        return False
 
     def is_legal_position(self, pos: tuple[int, int]) -> bool:
         x, y = pos
@@ -190,50 +543,64 @@ class Board:
         return True
 
     def is_legal_move(self, move: Move) -> bool:
+        return self.find_move(move.team, move.start_pos, move.end_pos) is not None
+
+    def find_move(
+        self, team: Team, start_pos: tuple[int, int], end_pos: tuple[int, int]
+    ) -> Move | None:
+        entry = move_cache.peek(self._cache_key(team))
+        if entry is not None:
+            return entry.get((start_pos, end_pos))
+        return self._rules.find_move(self, team, start_pos, end_pos)
+
+    def _is_legal_step(self, move: Move) -> bool:
         if not self.is_legal_position(move.start_pos):
             return False
         if not self.is_legal_position(move.end_pos):
             return False
 
-        start_value = self[move.start_pos]
-        end_value = self[move.end_pos]
+        dx = move.end_pos[0] - move.start_pos[0]
+        dy = move.end_pos[1] - move.start_pos[1]
 
-        if end_value != BoardValue.EMPTY:
+        if abs(dx) not in (1, 2):
             return False
 
-        if move.jump_pos is not None and self[move.jump_pos].team != move.team.other:
+        if abs(dx) != abs(dy):
             return False
 
-        if self._last_move is not None and move.team == self._last_move.team:
-            if move.start_pos != self._last_move.end_pos:
-                return False
-
-        if not move.is_capture:
-            for pos, value in self.items():
-                if value.team == move.team and self.is_capture_possible(pos):
-                    return False
-
-        dx = move.end_pos[0] - move.start_pos[0]
-        dy = move.end_pos[1] - move.start_pos[1]
+        start_value = self[move.start_pos]
+        end_value = self[move.end_pos]
 
-        if abs(dx) not in (1, 2):
+        if end_value != BoardValue.EMPTY:
             return False
 
-        if abs(dx) != abs(dy):
+        if start_value.team != move.team:
             return False
 
         if not start_value.king and dy // abs(dy) != move.team.direction:
             return False
 
-        if start_value.team != move.team:
+        if move.jump_pos is not None and self[move.jump_pos].team != move.team.other:
             return False
 
+        if self._forced_index(move.team) >= 0:
+            if move.start_pos != self._last_move.end_pos:
+                return False
+
         return True
 
     def possible_captures(self, start_pos: tuple[int, int]):
+        team = self[start_pos].team
+        if team is None:
+            return
+        for move in self._legal_moves(team).values():
+            if move.start_pos == start_pos and move.is_capture:
+                yield move
+
+    def _reference_captures(self, start_pos: tuple[int, int]):
         start_value = self[start_pos]
         if start_value == BoardValue.EMPTY:
-            return False
+            return
         team = start_value.team
 
         x, y = start_pos
@@ -250,7 +617,7 @@ class Board:
                     and self[free_space] == BoardValue.EMPTY
                 ):
                     move = Move(start_pos=start_pos, end_pos=free_space, team=team)
-                    if self.is_legal_move(move):
+                    if self._is_legal_step(move):
                         yield move
             except InvalidBoardPosition:
                 pass
@@ -260,19 +627,103 @@ class Board:
             return True
         return False
 
-    def perform_move(self, move: Move) -> None:
-        if not self.is_legal_move(move):
+    def perform_move(self, move: Move) -> Move:
+        legal_move = self.find_move(move.team, move.start_pos, move.end_pos)
+        if legal_move is None:
             raise IllegalMove
+        self._make(legal_move)
+        return legal_move
+
+    def _make(self, move: Move) -> tuple:
+        return self._rules.make(self, move)
+
+    def _unmake(self, undo: tuple) -> None:
+        self._rules.unmake(self, undo)
 
+    def _make_step(self, move: Move) -> tuple:
+        start_value = self[move.start_pos]
+        captured_value = None
         if move.jump_pos is not None:
+            captured_value = self[move.jump_pos]
             self[move.jump_pos] = BoardValue.EMPTY
 
-        if not self[move.start_pos].king and move.end_pos[1] == (
+        kinged = not start_value.king and move.end_pos[1] == (
             0 if move.team.direction == -1 else self.rows - 1
-        ):
-            self[move.end_pos] = self[move.start_pos].kinged
+        )
+        if kinged:
+            self[move.end_pos] = start_value.kinged
         else:
-            self[move.end_pos] = self[move.start_pos]
+            self[move.end_pos] = start_value
 
         self[move.start_pos] = BoardValue.EMPTY
+        undo = (
+            move,
+            start_value,
+            captured_value,
+            self._last_move,
+            self._turn_continues,
+        )
         self._last_move = move
+        self._turn_continues = (
+            captured_value is not None
+            and not kinged
+            and checkersai._core.can_capture_from(
+                self._cells,
+                self._cols,
+                self._rows,
+                move.end_pos[1] * self._cols + move.end_pos[0],
+            )
+        )
+        return undo
+
+    def _unmake_step(self, undo: tuple) -> None:
+        move, start_value, captured_value, last_move, turn_continues = undo
+        self[move.end_pos] = BoardValue.EMPTY
+        self[move.start_pos] = start_value
+        if captured_value is not None:
+            self[move.jump_pos] = captured_value
+        self._last_move = last_move
+        self._turn_continues = turn_continues
+
+    def possible_turns(self, team: Team):
+        turns = []
+        self._extend_turns(team, (), turns)
+        for turn in turns:
+            yield turn
+
+    def _extend_turns(self, team: Team, moves: tuple, turns: list) -> None:
+        for move in list(self.possible_moves(team)):
+            undo = self._make(move)
+            if self._turn_continues:
+                self._extend_turns(team, (*moves, move), turns)
+            else:
+                turns.append(CompoundMove((*moves, move)))
+            self._unmake(undo)
+
+    def perform_compound_move(self, move: CompoundMove) -> tuple:
+        undo = []
+        try:
+            for i, step in enumerate(move.moves):
+                step = self.find_move(step.team, step.start_pos, step.end_pos)
+                if step is None:
+                    raise IllegalMove
+                undo.append(self._make(step))
+                if self._turn_continues != (i < len(move.moves) - 1):
+                    raise IllegalMove
+        except IllegalMove:
+            self.undo_compound_move(tuple(undo))
+            raise
+        return tuple(undo)
+
+    def undo_compound_move(self, undo: tuple) -> None:
+        for step in reversed(undo):
+            self._unmake(step)
+
+    def perft(self, team: Team, depth: int) -> int:
+        return self._rules.perft(self, team, depth)
+
+    def _forced_index(self, team: Team) -> int:
+        if self._turn_continues and team == self._last_move.team:
+            x, y = self._last_move.end_pos
+            return y * self._cols + x
+        return -1
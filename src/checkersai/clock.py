@@ -0,0 +1,76 @@
+import abc
+import math
+
+import checkersai.board
+
+
+class IClockObserver(abc.ABC):
+    @abc.abstractmethod
+    def on_clock(self, time_left: float, increment: float) -> None:
+        raise NotImplementedError
+
+
+class Clock:
+    # Time left for each side, in the same seconds as GameData.current_time.
+    # The side to move's time runs from the first time the clock is read in
+    # its turn, so games that only set current_time once they are running
+    # aren't charged for the wait before.
+    def __init__(self, initial: float, increment: float = 0.0):
+        self.increment = increment
+        self._remaining = {team: initial for team in checkersai.board.Team}
+        self._turn_start = None
+
+    def time_left(self, team: checkersai.board.Team, now: float) -> float:
+        if self._turn_start is None:
+            self._turn_start = now
+        return self._remaining[team] - (now - self._turn_start)
+
+    def flagged(self, team: checkersai.board.Team, now: float) -> bool:
+        return self.time_left(team, now) <= 0
+
+    def press(self, team: checkersai.board.Team, now: float) -> None:
+        self._remaining[team] = self.time_left(team, now) + self.increment
+        self._turn_start = now
+
+
+class TimeManager:
+    # Decides how long an engine may think about one turn. The base budget
+    # spreads what is left over moves_to_go turns plus most of the increment,
+    # and is then scaled by how many turns there are to choose between.
+    # Overhead is what a turn costs besides thinking, e.g. pauses so that a
+    # human can follow the moves. It is cut down to max_overhead of an even
+    # share of the time left, and kept back for every one of the moves to go.
+    def __init__(
+        self,
+        *,
+        moves_to_go: int = 30,
+        overhead: float = 0.0,
+        max_overhead: float = 0.25,
+        max_fraction: float = 0.25,
+    ):
+        self._moves_to_go = moves_to_go
+        self._overhead = overhead
+        self._max_overhead = max_overhead
+        self._max_fraction = max_fraction
+
+    def overhead(self, time_left: float, increment: float) -> float:
+        share = max(time_left, 0.0) / self._moves_to_go + increment
+        return min(self._overhead, share * self._max_overhead)
+
+    def budget(
+        self,
+        turns: list[checkersai.board.CompoundMove],
+        time_left: float,
+        increment: float,
+    ) -> float:
+        if len(turns) <= 1:
+            return 0.0
+        reserved = self.overhead(time_left, increment) * self._moves_to_go
+        usable = max(time_left - reserved, 0.0)
+        base = usable / self._moves_to_go + 0.8 * increment
+        # Eight choices gets the base budget, up to twice that for wide open
+        # positions. A choice between captures is usually settled quickly.
+        scale = min(max(math.log2(len(turns)) / 3, 0.5), 2.0)
+        if turns[0].is_capture:
+            scale *= 0.5
+        return min(base * scale, usable * self._max_fraction)
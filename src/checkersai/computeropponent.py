@@ -1,30 +1,51 @@
 import abc
+import logging
 
 import checkersai.board
+import checkersai.clock
+import checkersai.evaluation
 import checkersai.game
 import checkersai.graphics
+import checkersai.observers
+import checkersai.search
 
 import random
 
 from checkersai.game import PlayerBoard
 
+logger = logging.getLogger(__name__)
 
-class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserver):
+
+class ComputerOpponent(
+    checkersai.game.IPlayer,
+    checkersai.observers.ITimerObserver,
+    checkersai.clock.IClockObserver,
+):
     def __init__(
         self,
         team: checkersai.board.Team,
-        gui: checkersai.graphics.Graphics,
+        gui: checkersai.graphics.Graphics | None,
         time_between_moves: float = 1.0,
         time_between_clicks: float = 0.5,
     ):
         self._team = team
-        gui.add_time_observer(self)
+        if gui is not None:
+            gui.add_time_observer(self)
         self._time_between_moves = time_between_moves
         self._time_between_clicks = time_between_clicks
+        # The pauses before clicking come off the clock too, so under one
+        # they get shorter as time runs low.
+        self._time_manager = checkersai.clock.TimeManager(
+            overhead=time_between_moves + time_between_clicks
+        )
+        self._pause_scale = 1.0
         self._next_move = None
+        self._planned_moves = []
         self._current_time = 0.0
         self._move_time = 0.0
         self._my_turn = False
+        self._time_left = None
+        self._increment = 0.0
 
     @property
     def team(self):
@@ -33,6 +54,14 @@ class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserv
     def on_frame(self, time: float) -> None:
         self._current_time = time
 
+    def on_clock(self, time_left: float, increment: float) -> None:
+        self._time_left = time_left
+        self._increment = increment
+        pauses = self._time_between_moves + self._time_between_clicks
+        if pauses > 0:
+            overhead = self._time_manager.overhead(time_left, increment)
+            self._pause_scale = overhead / pauses
+
     @property
     def selected_square(self) -> tuple[int, int] | None:
         if self._my_turn and self._current_time > self._move_time:
@@ -44,7 +73,8 @@ class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserv
     def destination_square(self) -> tuple[int, int] | None:
         if (
             self._my_turn
-            and self._current_time > self._move_time + self._time_between_clicks
+            and self._current_time
+            > self._move_time + self._time_between_clicks * self._pause_scale
         ):
             return self._next_move.end_pos
         else:
@@ -54,8 +84,22 @@ class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserv
         self._my_turn = True
 
     def on_move_started(self, board: checkersai.game.PlayerBoard) -> None:
-        self._next_move = self.next_move(board)
-        self._move_time = self._current_time + self._time_between_moves
+        if self._planned_moves:
+            self._next_move = self._planned_moves.pop(0)
+        else:
+            move = self.next_move(board)
+            if isinstance(move, checkersai.board.CompoundMove):
+                self._planned_moves = list(move.moves[1:])
+                move = move.moves[0]
+            self._next_move = move
+        self._move_time = (
+            self._current_time + self._time_between_moves * self._pause_scale
+        )
+
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
+        # Keep the rest of a planned turn in step with the board.
+        if self._planned_moves:
+            self._planned_moves.pop(0)
 
     def on_move_rejected(self) -> None:
         pass
@@ -65,6 +109,7 @@ class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserv
 
     def on_turn_completed(self) -> None:
         self._my_turn = False
+        self._planned_moves = []
 
     def on_win(self) -> None:
         pass
@@ -72,14 +117,81 @@ class ComputerOpponent(checkersai.game.IPlayer, checkersai.graphics.ITimerObserv
     def on_loss(self) -> None:
         pass
 
+    def on_draw(self) -> None:
+        pass
+
     @abc.abstractmethod
-    def next_move(self, board: checkersai.game.PlayerBoard) -> checkersai.board.Move:
+    def next_move(
+        self, board: checkersai.game.PlayerBoard
+    ) -> checkersai.board.Move | checkersai.board.CompoundMove:
         raise NotImplementedError
 
 
 class RandomOpponent(ComputerOpponent):
-    def __init__(self, team: checkersai.board.Team, gui: checkersai.graphics.Graphics):
+    def __init__(
+        self,
+        team: checkersai.board.Team,
+        gui: checkersai.graphics.Graphics | None,
+        rng: random.Random | None = None,
+    ):
         super().__init__(team, gui)
+        self._rng = random.Random() if rng is None else rng
 
     def next_move(self, board: checkersai.game.PlayerBoard) -> checkersai.board.Move:
-        return random.choice([move for move in board.possible_moves(self.team)])
+        return self._rng.choice([move for move in board.possible_moves(self.team)])
+
+
+def _network_evaluator(path: str) -> checkersai.evaluation.IEvaluator:
+    # numpy is optional, so only import the network when one is asked for.
+    import checkersai.network
+
+    return checkersai.network.NetworkEvaluator(
+        checkersai.network.ValueNetwork.load(path)
+    )
+
+
+class SearchOpponent(ComputerOpponent):
+    def __init__(
+        self,
+        team: checkersai.board.Team,
+        gui: checkersai.graphics.Graphics | None,
+        depth: int = 4,
+        weights: str | None = None,
+        network: str | None = None,
+        time_limit: float | None = None,
+        hash_mb: float = checkersai.search.DEFAULT_HASH_MB,
+    ):
+        super().__init__(team, gui)
+        self._time_limit = time_limit
+        if network is not None:
+            evaluator = _network_evaluator(network)
+        elif weights is None:
+            evaluator = checkersai.evaluation.LinearEvaluator()
+        else:
+            evaluator = checkersai.evaluation.LinearEvaluator.load(weights)
+        self._search = checkersai.search.AlphaBeta(
+            evaluator, depth, time_limit=time_limit, hash_mb=hash_mb
+        )
+        logger.info(
+            "Search tables for %s use %.1f MB.",
+            team.name,
+            self._search.nbytes / (1 << 20),
+        )
+
+    @property
+    def search(self) -> checkersai.search.AlphaBeta:
+        return self._search
+
+    def next_move(
+        self, board: checkersai.game.PlayerBoard
+    ) -> checkersai.board.CompoundMove:
+        turns = list(board.possible_turns(self.team))
+        if len(turns) == 1:
+            return turns[0]
+        if self._time_left is not None:
+            budget = self._time_manager.budget(turns, self._time_left, self._increment)
+            if self._time_limit is not None:
+                budget = min(budget, self._time_limit)
+            self._search.time_limit = budget
+        score, turn = self._search.search(board.copy(), self.team)
+        return turn
@@ -0,0 +1,99 @@
+import abc
+import json
+
+import checkersai.board
+
+FEATURES = ("men", "kings", "advancement", "back_rank", "center")
+
+# Hand-picked starting point, in the same units as tuned weights: the score is
+# the log-odds of the side to move winning.
+DEFAULT_WEIGHTS = {
+    "men": 0.5,
+    "kings": 0.8,
+    "advancement": 0.02,
+    "back_rank": 0.05,
+    "center": 0.05,
+}
+
+
+def features(
+    board: checkersai.board.Board, team: checkersai.board.Team
+) -> tuple[float, ...]:
+    # Differences between team and its opponent, so the same weights score
+    # either side.
+    other = team.other
+    counts = board.piece_counts
+    men = {
+        checkersai.board.Team.WHITE: counts[checkersai.board.BoardValue.WHITE_NORMAL],
+        checkersai.board.Team.BLACK: counts[checkersai.board.BoardValue.BLACK_NORMAL],
+    }
+    kings = {
+        checkersai.board.Team.WHITE: counts[checkersai.board.BoardValue.WHITE_KING],
+        checkersai.board.Team.BLACK: counts[checkersai.board.BoardValue.BLACK_KING],
+    }
+    center = {checkersai.board.Team.WHITE: 0, checkersai.board.Team.BLACK: 0}
+    col_min, col_max = board.cols // 4, board.cols - 1 - board.cols // 4
+    row_min, row_max = board.rows // 4, board.rows - 1 - board.rows // 4
+    for (x, y), value in board.pieces():
+        if col_min <= x <= col_max and row_min <= y <= row_max:
+            center[value.team] += 1
+    advancement = board.advancement
+    back_rank = board.back_rank_occupancy
+    return (
+        men[team] - men[other],
+        kings[team] - kings[other],
+        advancement[team] - advancement[other],
+        back_rank[team] - back_rank[other],
+        center[team] - center[other],
+    )
+
+
+class IEvaluator(abc.ABC):
+    # Batched evaluators score leaves in groups: search calls prepare() on
+    # each leaf while it is on the board, then evaluate_prepared() on them all.
+    # Prepared items that are plain floats are already scores.
+    batched = False
+
+    @abc.abstractmethod
+    def evaluate(
+        self, board: checkersai.board.Board, team: checkersai.board.Team
+    ) -> float:
+        raise NotImplementedError
+
+    def prepare(self, board: checkersai.board.Board, team: checkersai.board.Team):
+        return self.evaluate(board, team)
+
+    def evaluate_prepared(self, prepared: list) -> list[float]:
+        return list(prepared)
+
+
+class LinearEvaluator(IEvaluator):
+    def __init__(self, weights: dict[str, float] | None = None):
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError("Unknown features %s." % ", ".join(sorted(unknown)))
+        self._weights = tuple(weights.get(name, 0.0) for name in FEATURES)
+
+    @property
+    def weights(self) -> dict[str, float]:
+        return dict(zip(FEATURES, self._weights))
+
+    def evaluate(
+        self, board: checkersai.board.Board, team: checkersai.board.Team
+    ) -> float:
+        return sum(
+            weight * feature
+            for weight, feature in zip(self._weights, features(board, team))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LinearEvaluator":
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(dict(zip(data["features"], data["weights"])))
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"features": FEATURES, "weights": self._weights}, f, indent=2)
@@ -2,15 +2,23 @@ import abc
 import datetime
 import dataclasses
 import logging
+import time
+import typing
 
 import checkersai.board
+import checkersai.clock
+import checkersai.observers
+import checkersai.rules
 
 logger = logging.getLogger(__name__)
 
+# Frames skipped in a row at most by adaptive frame pacing.
+MAX_FRAME_SKIP = 5
+
 
 class PlayerBoard:
     def __init__(self, underlying: checkersai.board.Board):
-        self._underlying = underlying
+        self._underlying = underlying.copy()
 
     def __getitem__(self, item) -> checkersai.board.BoardValue:
         return self._underlying[item]
@@ -18,6 +26,16 @@ class PlayerBoard:
     def __str__(self) -> str:
         return str(self._underlying)
 
+    def to_string(self) -> str:
+        return self._underlying.to_string()
+
+    def copy(self) -> checkersai.board.Board:
+        return self._underlying.copy()
+
+    @property
+    def rules(self) -> checkersai.rules.Rules:
+        return self._underlying.rules
+
     @property
     def rows(self) -> int:
         return self._underlying.rows
@@ -26,6 +44,21 @@ class PlayerBoard:
     def cols(self) -> int:
         return self._underlying.cols
 
+    @property
+    def piece_counts(self):
+        return self._underlying.piece_counts
+
+    @property
+    def advancement(self):
+        return self._underlying.advancement
+
+    @property
+    def back_rank_occupancy(self):
+        return self._underlying.back_rank_occupancy
+
+    def num_pieces(self, team: checkersai.board.Team) -> int:
+        return self._underlying.num_pieces(team)
+
     def is_legal_position(self, pos: tuple[int, int]) -> bool:
         return self._underlying.is_legal_position(pos)
 
@@ -36,10 +69,20 @@ class PlayerBoard:
         for item in self._underlying.items():
             yield item
 
+    def pieces(self, team: checkersai.board.Team | None = None):
+        for item in self._underlying.pieces(team):
+            yield item
+
     def possible_moves(self, team: checkersai.board.Team):
         for move in self._underlying.possible_moves(team):
             yield move
 
+    def possible_turns(self, team: checkersai.board.Team):
+        # Turns are found by playing moves and taking them back, which must
+        # not touch a snapshot other threads may be reading.
+        for turn in self._underlying.copy().possible_turns(team):
+            yield turn
+
 
 class IPlayer(abc.ABC):
     @property
@@ -60,6 +103,10 @@ class IPlayer(abc.ABC):
     def on_move_started(self, board: PlayerBoard) -> None:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def on_move_rejected(self) -> None:
         raise NotImplementedError
@@ -80,6 +127,10 @@ class IPlayer(abc.ABC):
     def on_loss(self) -> None:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def on_draw(self) -> None:
+        raise NotImplementedError
+
 
 @dataclasses.dataclass
 class GameData:
@@ -88,6 +139,14 @@ class GameData:
     board: checkersai.board.Board
     current_time: float = 0
     last_move: checkersai.board.Move = None
+    max_turns_without_capture: int | None = None
+    turns_without_capture: int = 0
+    game_over: bool = False
+    winner: checkersai.board.Team | None = None
+    clock: checkersai.clock.Clock | None = None
+    auto_forced_moves: bool = False
+    forced_move: checkersai.board.Move | None = None
+    state: typing.Callable[["GameData"], typing.Any] | None = None
 
     @property
     def current_player(self) -> IPlayer:
@@ -100,10 +159,50 @@ class GameData:
     def change_player(self) -> None:
         self.current_player.on_turn_completed()
         self.current_team = self.current_team.other
-        if self.board.can_move(self.current_team):
-            logger.info("%s's turn.\n%s", self.current_team.name, self.board)
-            self.current_player.on_turn_started(PlayerBoard(self.board))
-            self.current_player.on_move_started(PlayerBoard(self.board))
+        if self.last_move is not None and self.last_move.is_capture:
+            self.turns_without_capture = 0
+        else:
+            self.turns_without_capture += 1
+        if self.clock is not None:
+            self.clock.press(self.current_team.other, self.current_time)
+        if self.update_status():
+            self.start_turn()
+
+    def start_turn(self) -> None:
+        logger.info("%s's turn.\n%s", self.current_team.name, self.board)
+        player = self.current_player
+        if self.clock is not None and isinstance(
+            player, checkersai.clock.IClockObserver
+        ):
+            player.on_clock(
+                self.clock.time_left(self.current_team, self.current_time),
+                self.clock.increment,
+            )
+        player.on_turn_started(PlayerBoard(self.board))
+        self.start_move()
+
+    def start_move(self) -> None:
+        # A move that is the only legal one is played by the game itself on
+        # the next step, and the player is only told about it.
+        if self.auto_forced_moves:
+            moves = list(self.board.possible_moves(self.current_team))
+            if len(moves) == 1:
+                self.forced_move = moves[0]
+                self.current_player.on_move_forced(self.forced_move)
+                return
+        self.current_player.on_move_started(PlayerBoard(self.board))
+
+    def update_status(self) -> bool:
+        if not self.board.can_move(self.current_team):
+            self.game_over = True
+            self.winner = self.current_team.other
+        elif (
+            self.max_turns_without_capture is not None
+            and self.turns_without_capture >= self.max_turns_without_capture
+        ):
+            self.game_over = True
+            self.winner = None
+        return not self.game_over
 
 
 class IGraphics(abc.ABC):
@@ -119,6 +218,10 @@ class IGraphics(abc.ABC):
     ) -> None:
         raise NotImplementedError
 
+    def update_all(self, games: list[GameData], time: float) -> None:
+        for data in games:
+            self.update(data, time)
+
 
 class Game:
     def __init__(
@@ -126,36 +229,66 @@ class Game:
         graphics: IGraphics,
         t_ms_per_update: datetime.timedelta,
         board_size: tuple[int, int],
+        max_turns_without_capture: int | None = 80,
+        rules: checkersai.rules.Rules | None = None,
+        time_control: tuple[float, float] | None = None,
+        auto_forced_moves: bool = False,
+        max_fps: float | None = 60.0,
+        adaptive_fps: bool = False,
     ):
         self._graphics = graphics
         self._t_ms_per_update = t_ms_per_update
         self._board_size = board_size
+        self._max_turns_without_capture = max_turns_without_capture
+        self._rules = rules
+        self._time_control = time_control
+        self._auto_forced_moves = auto_forced_moves
+        self._frame_interval = datetime.timedelta(0)
+        if max_fps:
+            self._frame_interval = datetime.timedelta(seconds=1 / max_fps)
+        self._adaptive_fps = adaptive_fps
 
     def start_game(
         self,
         white_player: IPlayer,
         black_player: IPlayer,
         first_team: checkersai.board.Team,
+        board: checkersai.board.Board | None = None,
+        turns_without_capture: int = 0,
     ) -> None:
-        data = GameData(
-            players={
-                checkersai.board.Team.WHITE: white_player,
-                checkersai.board.Team.BLACK: black_player,
-            },
-            current_team=first_team,
-            board=checkersai.board.Board(size=self._board_size),
+        # The first player may already be thinking in new_game, which counts
+        # towards the game time.
+        t_prev = datetime.datetime.now()
+        data = self.new_game(
+            white_player, black_player, first_team, board, turns_without_capture
         )
-        logger.info("%s's turn.\n%s", data.current_team.name, data.board)
-        data.current_player.on_turn_started(PlayerBoard(data.board))
-        data.current_player.on_move_started(PlayerBoard(data.board))
+        self._run([data], t_prev)
 
+    def start_games(
+        self,
+        matches: list[tuple[IPlayer, IPlayer]],
+        first_team: checkersai.board.Team,
+    ) -> list[GameData]:
+        # Plays several games side by side on the same clock, e.g. to watch a
+        # tournament with MultiGraphics.
         t_prev = datetime.datetime.now()
+        games = [self.new_game(white, black, first_team) for white, black in matches]
+        self._run(games, t_prev)
+        return games
+
+    def _run(self, games: list[GameData], t_prev: datetime.datetime) -> None:
+        # Logic runs in fixed steps on the game clock. Frames are drawn at most
+        # max_fps times a second, and the loop sleeps until the next step or
+        # frame is due. Adaptive pacing skips frames while the steps take
+        # longer than the time they cover, e.g. while an engine thinks, so
+        # the game clock catches up sooner.
         t_lag = datetime.timedelta(0)
         t_game = datetime.timedelta(0)
+        t_next_frame = t_prev
+        skipped = 0
+        running = [data for data in games if not data.game_over]
 
-        state = self._state_wait_player_move
-
-        while data.board.can_move(data.current_team):
+        while running:
             t_current = datetime.datetime.now()
             t_elapsed = t_current - t_prev
             t_prev = t_current
@@ -164,33 +297,100 @@ class Game:
             if self._graphics is not None:
                 self._graphics.handle_events()
 
-            while t_lag >= self._t_ms_per_update:
+            while t_lag >= self._t_ms_per_update and running:
                 t_lag -= self._t_ms_per_update
                 t_game += self._t_ms_per_update
-                data.current_time = t_game.total_seconds()
-                next_state = state(data)
-                if next_state is not None:
-                    state = next_state
-
-            if self._graphics is not None:
-                self._graphics.update(data, (t_game + t_lag).total_seconds())
-        logger.info("%s won.", data.current_team.other.name)
-        data.other_player.on_win()
-        data.current_player.on_loss()
+                for data in running:
+                    data.current_time = t_game.total_seconds()
+                    self.step(data)
+                running = [data for data in running if not data.game_over]
+
+            t_now = datetime.datetime.now()
+            if self._graphics is not None and t_now >= t_next_frame:
+                overloaded = t_now - t_current > self._t_ms_per_update
+                if self._adaptive_fps and overloaded and skipped < MAX_FRAME_SKIP:
+                    skipped += 1
+                else:
+                    skipped = 0
+                    self._graphics.update_all(games, (t_game + t_lag).total_seconds())
+                    t_next_frame = max(t_next_frame + self._frame_interval, t_now)
+
+            t_now = datetime.datetime.now()
+            t_next_step = t_prev + self._t_ms_per_update - t_lag
+            t_wake = t_next_step
+            if self._graphics is not None and self._frame_interval:
+                t_wake = min(t_wake, t_next_frame)
+            if running and t_wake > t_now:
+                time.sleep((t_wake - t_now).total_seconds())
+        for data in games:
+            self.end_game(data)
+
+    def new_game(
+        self,
+        white_player: IPlayer,
+        black_player: IPlayer,
+        first_team: checkersai.board.Team,
+        board: checkersai.board.Board | None = None,
+        turns_without_capture: int = 0,
+    ) -> GameData:
+        # Games start from the usual position unless given another one.
+        if board is None:
+            board = checkersai.board.Board(size=self._board_size, rules=self._rules)
+        data = GameData(
+            players={
+                checkersai.board.Team.WHITE: white_player,
+                checkersai.board.Team.BLACK: black_player,
+            },
+            current_team=first_team,
+            board=board.copy(),
+            max_turns_without_capture=self._max_turns_without_capture,
+            turns_without_capture=turns_without_capture,
+            auto_forced_moves=self._auto_forced_moves,
+            state=self._state_wait_player_move,
+        )
+        if self._time_control is not None:
+            data.clock = checkersai.clock.Clock(*self._time_control)
+        if data.update_status():
+            data.start_turn()
+        return data
+
+    def step(self, data: GameData) -> None:
+        # Players that pace themselves follow the game clock, with or without
+        # graphics to draw frames.
+        for player in data.players.values():
+            if isinstance(player, checkersai.observers.ITimerObserver):
+                player.on_frame(data.current_time)
+        if data.clock is not None and data.clock.flagged(
+            data.current_team, data.current_time
+        ):
+            logger.info("%s ran out of time.", data.current_team.name)
+            data.game_over = True
+            data.winner = data.current_team.other
+            return
+        next_state = data.state(data)
+        if next_state is not None:
+            data.state = next_state
+
+    def end_game(self, data: GameData) -> None:
+        if data.winner is None:
+            logger.info(
+                "Draw after %d turns without a capture.", data.turns_without_capture
+            )
+            data.current_player.on_draw()
+            data.other_player.on_draw()
+        else:
+            logger.info("%s won.", data.winner.name)
+            data.players[data.winner].on_win()
+            data.players[data.winner.other].on_loss()
 
     def _state_wait_player_move(self, data: GameData) -> None:
-        start_pos = data.current_player.selected_square
-        end_pos = data.current_player.destination_square
+        start_pos, end_pos = self._chosen_squares(data)
 
         if start_pos is not None and end_pos is not None:
-            move, kinged = self._perform_move(data, start_pos, end_pos)
+            move = self._perform_move(data, start_pos, end_pos)
             if move is not None:
-                if (
-                    not kinged
-                    and move.is_capture
-                    and data.board.is_capture_possible(move.end_pos)
-                ):
-                    data.current_player.on_move_started(PlayerBoard(data.board))
+                if data.board.turn_in_progress:
+                    data.start_move()
                     return self._state_wait_player_jump
                 else:
                     data.change_player()
@@ -198,29 +398,38 @@ class Game:
                 data.current_player.on_move_rejected()
 
     def _state_wait_player_jump(self, data: GameData) -> None:
-        start_pos = data.last_move.end_pos
-        if data.current_player.selected_square == data.last_move.end_pos:
-            end_pos = data.current_player.destination_square
+        start_pos, end_pos = self._chosen_squares(data)
+        if start_pos == data.last_move.end_pos:
             if end_pos is not None:
-                move, kinged = self._perform_move(data, start_pos, end_pos)
+                move = self._perform_move(data, start_pos, end_pos)
                 if move is not None:
-                    if kinged or not data.board.is_capture_possible(end_pos):
+                    if not data.board.turn_in_progress:
                         data.change_player()
                         return self._state_wait_player_move
                     else:
                         data.current_player.on_move_completed()
-                        data.current_player.on_move_started(PlayerBoard(data.board))
+                        data.start_move()
                 else:
                     data.current_player.on_move_rejected()
 
+    def _chosen_squares(
+        self, data: GameData
+    ) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+        if data.forced_move is not None:
+            move = data.forced_move
+            data.forced_move = None
+            return move.start_pos, move.end_pos
+        return (
+            data.current_player.selected_square,
+            data.current_player.destination_square,
+        )
+
     def _perform_move(
         self, data: GameData, start_pos: tuple[int, int], end_pos: tuple[int, int]
-    ) -> tuple[checkersai.board.Move, bool]:
-        was_king = data.board[start_pos].king
-        move = checkersai.board.Move(
-            team=data.current_team, start_pos=start_pos, end_pos=end_pos
-        )
-        if data.board.is_legal_move(move):
+    ) -> checkersai.board.Move | None:
+        # The rules decide whether the turn carries on, e.g. after a promotion.
+        move = data.board.find_move(data.current_team, start_pos, end_pos)
+        if move is not None:
             data.board.perform_move(move)
             logger.info(
                 "%s moves (%d, %d) -> (%d, %d).",
@@ -230,5 +439,5 @@ class Game:
             )
             data.last_move = move
             data.current_player.on_move_completed()
-            return move, not was_king and data.board[end_pos].king
-        return None, None
+            return move
+        return None
@@ -1,24 +1,42 @@
-import abc
 import json
+import math
 import os
-import pygame
 import random
 import sys
 
 import checkersai.board
 import checkersai.game
+import checkersai.observers
 
+# The observer interfaces used to live here.
+ISquareClickedObserver = checkersai.observers.ISquareClickedObserver
+ITimerObserver = checkersai.observers.ITimerObserver
 
-class ISquareClickedObserver(abc.ABC):
-    @abc.abstractmethod
-    def on_square_clicked(self, pos: tuple[int, int]) -> None:
-        raise NotImplementedError
+# Imported by the first Graphics, so that headless processes never load it.
+pygame = None
 
+_sprites = {}
 
-class ITimerObserver(abc.ABC):
-    @abc.abstractmethod
-    def on_frame(self, time: float) -> None:
-        raise NotImplementedError
+
+def _sprite(name: str, size: tuple[int, int], alpha: bool = True) -> object:
+    # Scaled and converted to the display's format once for each size, then
+    # shared by every board drawn at that size.
+    key = (name, size)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = pygame.transform.scale(
+            pygame.image.load(os.path.join("data", name)), size
+        )
+        sprite = sprite.convert_alpha() if alpha else sprite.convert()
+        _sprites[key] = sprite
+    return sprite
+
+
+def _tile(surface, name: str) -> None:
+    image = pygame.image.load(os.path.join("data", name)).convert()
+    for y in range(0, surface.get_height(), image.get_height()):
+        for x in range(0, surface.get_width(), image.get_width()):
+            surface.blit(image, (x, y))
 
 
 class Graphics(checkersai.game.IGraphics):
@@ -30,8 +48,14 @@ class Graphics(checkersai.game.IGraphics):
         screen_height: int = None,
         board_width: int = None,
         board_height: int = None,
+        rng: random.Random | None = None,
     ):
+        global pygame
+        import pygame
+
         pygame.init()
+        if rng is None:
+            rng = random.Random()
         if screen_height is None:
             screen_height = 720
         if screen_width is None:
@@ -54,11 +78,8 @@ class Graphics(checkersai.game.IGraphics):
         with open("data/index.json", "r") as f:
             data = json.load(f)
 
-        self._bg_surface = pygame.Surface((screen_width, screen_height))
-        bg_img = pygame.image.load("data/" + data["background"])
-        for y in range(0, screen_height, bg_img.get_height()):
-            for x in range(0, screen_width, bg_img.get_width()):
-                self._bg_surface.blit(bg_img, (x, y))
+        self._bg_surface = pygame.Surface((screen_width, screen_height)).convert()
+        _tile(self._bg_surface, data["background"])
 
         square_fields = {0: "white_square", 1: "black_square"}
         board_left = screen_width // 2 - board_width // 2
@@ -67,10 +88,9 @@ class Graphics(checkersai.game.IGraphics):
             x = board_left + self._cell_width * icol
             for irow in range(board_rows):
                 y = board_top + self._cell_height * irow
-                source = random.choice(data[square_fields[(icol + irow) % 2]])
-                square_img = pygame.transform.scale(
-                    pygame.image.load("data/" + source),
-                    (self._cell_width, self._cell_height),
+                source = rng.choice(data[square_fields[(icol + irow) % 2]])
+                square_img = _sprite(
+                    source, (self._cell_width, self._cell_height), alpha=False
                 )
                 self._bg_surface.blit(square_img, (x, y))
 
@@ -90,12 +110,10 @@ class Graphics(checkersai.game.IGraphics):
 
         self._square_click_observers = set()
         self._time_observers = set()
+        self._drawn = None
 
     def _load_image(self, data, key) -> object:
-        return pygame.transform.scale(
-            pygame.image.load(os.path.join("data", data[key])),
-            (self._cell_width, self._cell_height),
-        )
+        return _sprite(data[key], (self._cell_width, self._cell_height))
 
     def update(
         self,
@@ -105,15 +123,24 @@ class Graphics(checkersai.game.IGraphics):
         for observer in self._time_observers:
             observer.on_frame(time)
 
+        # The window keeps the last frame until something on it changes.
+        state = (
+            data.board.position_hash,
+            data.current_team,
+            data.current_player.selected_square,
+        )
+        if state == self._drawn:
+            return
+        self._drawn = state
+
         self._screen.blit(self._bg_surface, (0, 0))
 
         capturable_squares = set()
-        for pos, value in data.board.items():
-            if value.team == data.current_team:
-                for q in data.board.possible_captures(pos):
-                    capturable_squares.add(q.jump_pos)
+        for move in data.board.possible_moves(data.current_team):
+            if move.is_capture:
+                capturable_squares.add(move.jump_pos)
 
-        for pos, value in data.board.items():
+        for pos, value in data.board.pieces():
             icol, irow = pos
             x = self._board_left + self._cell_width * icol
             y = self._board_top + self._cell_height * irow
@@ -135,6 +162,9 @@ class Graphics(checkersai.game.IGraphics):
             if event.type == pygame.QUIT:
                 sys.exit()
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._drawn = None
+
             if event.type == pygame.MOUSEBUTTONUP:
                 mouse_x, mouse_y = pygame.mouse.get_pos()
                 x = (mouse_x - self._board_left) // self._cell_width
@@ -147,3 +177,207 @@ class Graphics(checkersai.game.IGraphics):
 
     def add_time_observer(self, observer: ITimerObserver) -> None:
         self._time_observers.add(observer)
+
+
+class Thumbnails:
+    # Draws boards on plain surfaces to save as images, without a window.
+    # Sprites are only converted for speed against a display, so unless one
+    # is open already a 1x1 one is made on SDL's dummy video driver. The
+    # squares for each board size are composed once.
+    def __init__(self, *, size: int = 256, rng: random.Random | None = None):
+        global pygame
+        import pygame
+
+        if not pygame.display.get_init():
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+        self._size = size
+        self._rng = random.Random() if rng is None else rng
+        with open("data/index.json", "r") as f:
+            self._data = json.load(f)
+        self._backgrounds = {}
+
+    def _background(self, cols: int, rows: int) -> tuple:
+        cell = max(self._size // max(cols, rows), 1)
+        key = (cols, rows)
+        background = self._backgrounds.get(key)
+        if background is None:
+            background = pygame.Surface((cell * cols, cell * rows)).convert()
+            square_fields = {0: "white_square", 1: "black_square"}
+            for icol in range(cols):
+                for irow in range(rows):
+                    source = self._rng.choice(
+                        self._data[square_fields[(icol + irow) % 2]]
+                    )
+                    background.blit(
+                        _sprite(source, (cell, cell), alpha=False),
+                        (cell * icol, cell * irow),
+                    )
+            self._backgrounds[key] = background
+        return background, cell
+
+    def render(self, board: checkersai.board.Board) -> object:
+        background, cell = self._background(board.cols, board.rows)
+        surface = background.copy()
+        size = (cell, cell)
+        pieces = {
+            checkersai.board.Team.WHITE: _sprite(self._data["white_piece"], size),
+            checkersai.board.Team.BLACK: _sprite(self._data["black_piece"], size),
+        }
+        king = _sprite(self._data["king_overlay"], size)
+        for (icol, irow), value in board.pieces():
+            pos = (cell * icol, cell * irow)
+            surface.blit(pieces[value.team], pos)
+            if value.king:
+                surface.blit(king, pos)
+        return surface
+
+    def save(self, board: checkersai.board.Board, path: str) -> None:
+        pygame.image.save(self.render(board), path)
+
+
+class MultiGraphics(checkersai.game.IGraphics):
+    # Shows several games at once, each board in its own cell of a grid. The
+    # background with every board's squares is composed once. A board is only
+    # drawn again when something on it changed, by restoring its cell from the
+    # background, and only the cells drawn are sent to the display.
+    def __init__(
+        self,
+        *,
+        boards: int,
+        screen_width: int = 1280,
+        screen_height: int = 720,
+        margin: int = 8,
+        rng: random.Random | None = None,
+    ):
+        global pygame
+        import pygame
+
+        pygame.init()
+        self._screen = pygame.display.set_mode((screen_width, screen_height))
+        self._rng = random.Random() if rng is None else rng
+
+        with open("data/index.json", "r") as f:
+            self._data = json.load(f)
+
+        # As many columns as keeps the cells closest to square.
+        grid_cols = max(
+            range(1, boards + 1),
+            key=lambda cols: min(
+                screen_width // cols, screen_height // math.ceil(boards / cols)
+            ),
+        )
+        grid_rows = math.ceil(boards / grid_cols)
+        cell = min(screen_width // grid_cols, screen_height // grid_rows)
+        left = (screen_width - cell * grid_cols) // 2
+        top = (screen_height - cell * grid_rows) // 2
+        self._viewports = [
+            pygame.Rect(
+                left + cell * (i % grid_cols) + margin // 2,
+                top + cell * (i // grid_cols) + margin // 2,
+                cell - margin,
+                cell - margin,
+            )
+            for i in range(boards)
+        ]
+
+        self._bg_surface = pygame.Surface((screen_width, screen_height)).convert()
+        _tile(self._bg_surface, self._data["background"])
+        self._screen.blit(self._bg_surface, (0, 0))
+        pygame.display.flip()
+
+        # Games get the next free cell the first time they are drawn.
+        self._games = []
+        self._layouts = []
+        self._drawn = []
+
+        self._time_observers = set()
+
+    def _layout(self, index: int, board: checkersai.board.Board) -> tuple:
+        viewport = self._viewports[index]
+        size = (viewport.width // board.cols, viewport.height // board.rows)
+        left = viewport.centerx - size[0] * board.cols // 2
+        top = viewport.centery - size[1] * board.rows // 2
+        square_fields = {0: "white_square", 1: "black_square"}
+        for icol in range(board.cols):
+            for irow in range(board.rows):
+                source = self._rng.choice(self._data[square_fields[(icol + irow) % 2]])
+                self._bg_surface.blit(
+                    _sprite(source, size, alpha=False),
+                    (left + size[0] * icol, top + size[1] * irow),
+                )
+        return left, top, size
+
+    def _draw(self, index: int, data: checkersai.game.GameData) -> None:
+        viewport = self._viewports[index]
+        left, top, size = self._layouts[index]
+        self._screen.blit(self._bg_surface, viewport, viewport)
+
+        capturable_squares = set()
+        if not data.game_over:
+            for move in data.board.possible_moves(data.current_team):
+                if move.is_capture:
+                    capturable_squares.add(move.jump_pos)
+
+        pieces = {
+            checkersai.board.Team.WHITE: _sprite(self._data["white_piece"], size),
+            checkersai.board.Team.BLACK: _sprite(self._data["black_piece"], size),
+        }
+        selected = data.current_player.selected_square
+        for pos, value in data.board.pieces():
+            x = left + size[0] * pos[0]
+            y = top + size[1] * pos[1]
+            if pos == selected:
+                self._screen.blit(
+                    _sprite(self._data["selected_underlay"], size), (x, y)
+                )
+            elif pos in capturable_squares:
+                self._screen.blit(
+                    _sprite(self._data["capturable_underlay"], size), (x, y)
+                )
+            self._screen.blit(pieces[value.team], (x, y))
+            if value.king:
+                self._screen.blit(_sprite(self._data["king_overlay"], size), (x, y))
+
+    def update(self, data: checkersai.game.GameData, time: float) -> None:
+        self.update_all([data], time)
+
+    def update_all(self, games: list[checkersai.game.GameData], time: float) -> None:
+        for observer in self._time_observers:
+            observer.on_frame(time)
+
+        dirty = []
+        for data in games:
+            for index, game in enumerate(self._games):
+                if game is data:
+                    break
+            else:
+                index = len(self._games)
+                if index == len(self._viewports):
+                    raise ValueError("No room for more than %d boards." % index)
+                self._games.append(data)
+                self._layouts.append(self._layout(index, data.board))
+                self._drawn.append(None)
+            state = (
+                data.board.position_hash,
+                data.current_team,
+                data.current_player.selected_square,
+                data.game_over,
+            )
+            if state != self._drawn[index]:
+                self._drawn[index] = state
+                self._draw(index, data)
+                dirty.append(self._viewports[index])
+
+        if dirty:
+            pygame.display.update(dirty)
+
+    def handle_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit()
+
+    def add_time_observer(self, observer: ITimerObserver) -> None:
+        self._time_observers.add(observer)
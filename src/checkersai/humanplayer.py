@@ -1,9 +1,10 @@
 import checkersai.board
 import checkersai.game
 import checkersai.graphics
+import checkersai.observers
 
 
-class HumanPlayer(checkersai.game.IPlayer, checkersai.graphics.ISquareClickedObserver):
+class HumanPlayer(checkersai.game.IPlayer, checkersai.observers.ISquareClickedObserver):
     def __init__(self, team: checkersai.board.Team, gui: checkersai.graphics.Graphics):
         self._team = team
         self._start_pos = None
@@ -39,6 +40,11 @@ class HumanPlayer(checkersai.game.IPlayer, checkersai.graphics.ISquareClickedObs
         self._board = board
 
     def on_move_started(self, board: checkersai.game.PlayerBoard) -> None:
+        self._board = board
+        self._start_pos = None
+        self._end_pos = None
+
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
         self._start_pos = None
         self._end_pos = None
 
@@ -58,3 +64,6 @@ class HumanPlayer(checkersai.game.IPlayer, checkersai.graphics.ISquareClickedObs
 
     def on_loss(self) -> None:
         pass
+
+    def on_draw(self) -> None:
+        pass
@@ -0,0 +1,170 @@
+import logging
+
+import numpy as np
+
+import checkersai.board
+import checkersai.evaluation
+import checkersai.search
+import checkersai.tuning
+
+logger = logging.getLogger(__name__)
+
+PLANES = 4
+
+
+def planes(board: checkersai.board.Board, team: checkersai.board.Team) -> np.ndarray:
+    # One plane per kind of piece over all squares: own men, own kings, enemy
+    # men, enemy kings. Black's boards are turned round so that the side to
+    # move always plays up the board.
+    cols = board.cols
+    rows = board.rows
+    squares = cols * rows
+    x = np.zeros(PLANES * squares, dtype=np.float32)
+    flip = team == checkersai.board.Team.BLACK
+    for (col, row), value in board.pieces():
+        if flip:
+            col = cols - 1 - col
+            row = rows - 1 - row
+        plane = (0 if value.team == team else 2) + value.king
+        x[plane * squares + row * cols + col] = 1.0
+    return x
+
+
+def position_rows(game: dict) -> list[np.ndarray]:
+    return [
+        np.append(planes(board, team), target)
+        for board, team, target in checkersai.tuning.positions(game)
+    ]
+
+
+class ValueNetwork:
+    # A one hidden layer perceptron. Its output is in the same units as the
+    # linear evaluation: the log-odds of the side to move winning.
+    def __init__(self, w1: np.ndarray, b1: np.ndarray, w2: np.ndarray, b2: np.ndarray):
+        self.w1 = w1
+        self.b1 = b1
+        self.w2 = w2
+        self.b2 = b2
+
+    @classmethod
+    def create(
+        cls, inputs: int, hidden: int = 64, rng: np.random.Generator | None = None
+    ) -> "ValueNetwork":
+        if rng is None:
+            rng = np.random.default_rng()
+        return cls(
+            rng.normal(0.0, np.sqrt(2.0 / inputs), (inputs, hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            rng.normal(0.0, np.sqrt(1.0 / hidden), (hidden, 1)).astype(np.float32),
+            np.zeros(1, dtype=np.float32),
+        )
+
+    @property
+    def inputs(self) -> int:
+        return self.w1.shape[0]
+
+    @property
+    def parameters(self) -> tuple[np.ndarray, ...]:
+        return self.w1, self.b1, self.w2, self.b2
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        hidden = np.maximum(x @ self.w1 + self.b1, 0.0)
+        return (hidden @ self.w2 + self.b2)[:, 0]
+
+    def gradients(
+        self, x: np.ndarray, y: np.ndarray
+    ) -> tuple[float, tuple[np.ndarray, ...]]:
+        # Log loss against the results and its gradients for each parameter.
+        hidden = np.maximum(x @ self.w1 + self.b1, 0.0)
+        out = (hidden @ self.w2 + self.b2)[:, 0]
+        p = 1.0 / (1.0 + np.exp(-out))
+        eps = 1e-7
+        loss = -np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps))
+        d_out = ((p - y) / len(y))[:, None].astype(np.float32)
+        d_hidden = (d_out @ self.w2.T) * (hidden > 0)
+        return float(loss), (
+            x.T @ d_hidden,
+            d_hidden.sum(axis=0),
+            hidden.T @ d_out,
+            d_out.sum(axis=0),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ValueNetwork":
+        with np.load(path) as data:
+            return cls(data["w1"], data["b1"], data["w2"], data["b2"])
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+
+class NetworkEvaluator(checkersai.evaluation.IEvaluator):
+    batched = True
+
+    # Keeps a small cache of recent results for callers outside search.
+    # Search has a bigger evaluation cache of its own in front of this one.
+    def __init__(self, network: ValueNetwork, cache_entries: int = 4096):
+        self._network = network
+        self._cache = checkersai.search.EvaluationCache(cache_entries)
+
+    def evaluate(
+        self, board: checkersai.board.Board, team: checkersai.board.Team
+    ) -> float:
+        return self.evaluate_prepared([self.prepare(board, team)])[0]
+
+    def prepare(self, board: checkersai.board.Board, team: checkersai.board.Team):
+        key = checkersai.search.table_key(board, team)
+        score = self._cache.get(key)
+        if score is not None:
+            return score
+        return key, planes(board, team)
+
+    def evaluate_prepared(self, prepared: list) -> list[float]:
+        misses = [i for i, item in enumerate(prepared) if isinstance(item, tuple)]
+        if not misses:
+            return prepared
+        # All the leaves that missed the cache go through in one batch.
+        scores = self._network.forward(np.stack([prepared[i][1] for i in misses]))
+        result = list(prepared)
+        for i, score in zip(misses, scores.tolist()):
+            self._cache.put(prepared[i][0], score)
+            result[i] = score
+        return result
+
+
+def train(
+    cache_path: str,
+    network: ValueNetwork,
+    *,
+    epochs: int = 20,
+    batch_size: int = 256,
+    learning_rate: float = 1e-3,
+    seed: int = 0,
+) -> ValueNetwork:
+    # Adam over mini-batches read straight from the memory-mapped cache.
+    data = checkersai.tuning.load_positions(cache_path, network.inputs + 1)
+    rng = np.random.default_rng(seed)
+    moments = [np.zeros_like(p) for p in network.parameters]
+    velocities = [np.zeros_like(p) for p in network.parameters]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    starts = np.arange(0, len(data), batch_size)
+    for epoch in range(epochs):
+        rng.shuffle(starts)
+        total = 0.0
+        for first in starts:
+            batch = np.asarray(data[first : first + batch_size])
+            loss, grads = network.gradients(batch[:, :-1], batch[:, -1])
+            total += loss * len(batch)
+            step += 1
+            for p, g, m, v in zip(network.parameters, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                m_hat = m / (1 - beta1**step)
+                v_hat = v / (1 - beta2**step)
+                p -= (learning_rate * m_hat / (np.sqrt(v_hat) + eps)).astype(p.dtype)
+        logger.info("Epoch %d: loss %.4f.", epoch + 1, total / len(data))
+    return network
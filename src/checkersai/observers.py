@@ -0,0 +1,13 @@
+import abc
+
+
+class ISquareClickedObserver(abc.ABC):
+    @abc.abstractmethod
+    def on_square_clicked(self, pos: tuple[int, int]) -> None:
+        raise NotImplementedError
+
+
+class ITimerObserver(abc.ABC):
+    @abc.abstractmethod
+    def on_frame(self, time: float) -> None:
+        raise NotImplementedError
@@ -0,0 +1,91 @@
+import array
+
+import checkersai.board
+
+# Ranks sort before any score within them, so a big history count can never
+# lift a quiet turn above a capture or a killer.
+_TABLE = 3
+_CAPTURE = 2
+_KILLER = 1
+_QUIET = 0
+
+# History counts are halved once one gets this big, and between searches.
+_HISTORY_LIMIT = 1 << 24
+
+
+class MoveOrdering:
+    # Puts the turns most likely to cause a cutoff first: the table's best
+    # turn, then captures taking the most pieces, then quiet turns that
+    # caused cutoffs at the same ply (killers) and finally quiet turns by
+    # how often they caused cutoffs anywhere (history). History is indexed
+    # by the start square and direction of a turn. Only dark squares are
+    # played on and no two of them are next to each other, so half the
+    # square index tells them apart.
+    def __init__(self, killers_per_ply: int = 2):
+        self._killers_per_ply = killers_per_ply
+        self._killers = []
+        self._history = array.array("I")
+        self._squares = 0
+        self._cols = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._history) * self._history.itemsize
+
+    def new_search(self, board: checkersai.board.Board) -> None:
+        squares = board.cols * board.rows
+        if squares != self._squares:
+            self._squares = squares
+            self._history = array.array("I", [0]) * ((squares + 1) // 2 * 4)
+        else:
+            self._age()
+        self._cols = board.cols
+        self._killers = []
+
+    def order(
+        self,
+        turns: list[checkersai.board.CompoundMove],
+        table_turn: checkersai.board.CompoundMove | None,
+        ply: int,
+    ) -> list[checkersai.board.CompoundMove]:
+        killers = self._killers[ply] if ply < len(self._killers) else ()
+        history = self._history
+        index = self._index
+
+        def key(turn):
+            if turn == table_turn:
+                return (_TABLE, 0)
+            if turn.is_capture:
+                return (_CAPTURE, len(turn.moves))
+            if turn in killers:
+                return (_KILLER, -killers.index(turn))
+            return (_QUIET, history[index(turn)])
+
+        return sorted(turns, key=key, reverse=True)
+
+    def cutoff(self, turn: checkersai.board.CompoundMove, depth: int, ply: int) -> None:
+        # Captures are searched early anyway, so only quiet turns are kept.
+        if turn.is_capture:
+            return
+        while len(self._killers) <= ply:
+            self._killers.append([])
+        killers = self._killers[ply]
+        if turn in killers:
+            killers.remove(turn)
+        killers.insert(0, turn)
+        del killers[self._killers_per_ply :]
+        i = self._index(turn)
+        self._history[i] += depth * depth
+        if self._history[i] >= _HISTORY_LIMIT:
+            self._age()
+
+    def _index(self, turn: checkersai.board.CompoundMove) -> int:
+        (start_x, start_y), (end_x, end_y) = turn.start_pos, turn.end_pos
+        square = (start_y * self._cols + start_x) >> 1
+        return square << 2 | (end_x > start_x) << 1 | (end_y > start_y)
+
+    def _age(self) -> None:
+        history = self._history
+        for i, count in enumerate(history):
+            if count:
+                history[i] = count >> 1
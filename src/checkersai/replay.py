@@ -0,0 +1,72 @@
+import collections
+import datetime
+
+import checkersai.archive
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.graphics
+
+
+class ReplayFinished(Exception):
+    pass
+
+
+class ReplayOpponent(checkersai.computeropponent.ComputerOpponent):
+    # Both sides share the recorded turns and take them in order.
+    def __init__(
+        self,
+        team: checkersai.board.Team,
+        gui: checkersai.graphics.Graphics | None,
+        turns: collections.deque,
+    ):
+        super().__init__(team, gui)
+        self._turns = turns
+
+    def next_move(
+        self, board: checkersai.game.PlayerBoard
+    ) -> checkersai.board.CompoundMove:
+        if not self._turns:
+            raise ReplayFinished
+        return checkersai.archive.find_turn(board.copy(), self.team, self._turns[0])
+
+    def on_turn_completed(self) -> None:
+        super().on_turn_completed()
+        self._turns.popleft()
+
+
+def replay(
+    gui: checkersai.graphics.Graphics,
+    game: dict,
+    number: int = 0,
+    *,
+    max_turns_without_capture: int | None = 80,
+) -> None:
+    # Plays the game back from before turn number through the normal game
+    # loop, so it looks just like the game did.
+    board, team = checkersai.archive.position(game, number)
+    played = game["turns"][:number]
+    quiet = len(played)
+    for i, text in enumerate(reversed(played)):
+        if "x" in text:
+            quiet = i
+            break
+    turns = collections.deque(game["turns"][number:])
+    players = {team: ReplayOpponent(team, gui, turns) for team in checkersai.board.Team}
+    runner = checkersai.game.Game(
+        gui,
+        datetime.timedelta(milliseconds=16.67),
+        (board.cols, board.rows),
+        game.get("max_turns_without_capture", max_turns_without_capture),
+        board.rules,
+    )
+    try:
+        runner.start_game(
+            players[checkersai.board.Team.WHITE],
+            players[checkersai.board.Team.BLACK],
+            team,
+            board=board,
+            turns_without_capture=quiet,
+        )
+    except ReplayFinished:
+        pass
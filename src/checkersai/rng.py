@@ -0,0 +1,20 @@
+import hashlib
+import random
+
+# Every stream of random numbers is seeded from the master seed and a path
+# saying what it is for, e.g. ("selfplay", 12) for the thirteenth self-play
+# game. Streams are then independent of each other and of which process they
+# end up in, so runs repeat exactly however the work is split.
+
+
+def derive_seed(master: int, *path) -> int:
+    key = repr((master, *path)).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def stream(master: int, *path) -> random.Random:
+    return random.Random(derive_seed(master, *path))
+
+
+def master_seed() -> int:
+    return random.SystemRandom().getrandbits(32)
@@ -0,0 +1,377 @@
+import abc
+
+import checkersai._core
+import checkersai.board
+
+from checkersai._core import DIRECTIONS, EMPTY, WHITE_KING, team_of
+
+
+class Rules(abc.ABC):
+    name = None
+    default_size = (8, 8)
+    start_rows = 3
+
+    def __repr__(self) -> str:
+        return "%s()" % type(self).__name__
+
+    def __reduce__(self):
+        return variant, (self.name,)
+
+    @abc.abstractmethod
+    def generate_moves(
+        self, board: "checkersai.board.Board", team: "checkersai.board.Team"
+    ):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def make(
+        self, board: "checkersai.board.Board", move: "checkersai.board.Move"
+    ) -> tuple:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def unmake(self, board: "checkersai.board.Board", undo: tuple) -> None:
+        raise NotImplementedError
+
+    def find_move(
+        self,
+        board: "checkersai.board.Board",
+        team: "checkersai.board.Team",
+        start_pos: tuple[int, int],
+        end_pos: tuple[int, int],
+    ) -> "checkersai.board.Move | None":
+        return board._legal_moves(team).get((start_pos, end_pos))
+
+    def perft(
+        self, board: "checkersai.board.Board", team: "checkersai.board.Team", depth: int
+    ) -> int:
+        if depth == 0:
+            return 1
+        moves = list(board.possible_moves(team))
+        if depth == 1:
+            return len(moves)
+        total = 0
+        for move in moves:
+            undo = self.make(board, move)
+            next_team = team if board.turn_in_progress else team.other
+            total += self.perft(board, next_team, depth - 1)
+            self.unmake(board, undo)
+        return total
+
+
+class EnglishRules(Rules):
+    # The board's own move generation, kept free of any variant checks.
+    name = "english"
+    start_rows = 2
+
+    def generate_moves(
+        self, board: "checkersai.board.Board", team: "checkersai.board.Team"
+    ):
+        if checkersai.board.ACCELERATED:
+            return board._core_moves(team)
+        return board._reference_moves(team)
+
+    def make(
+        self, board: "checkersai.board.Board", move: "checkersai.board.Move"
+    ) -> tuple:
+        return board._make_step(move)
+
+    def unmake(self, board: "checkersai.board.Board", undo: tuple) -> None:
+        board._unmake_step(undo)
+
+    def find_move(
+        self,
+        board: "checkersai.board.Board",
+        team: "checkersai.board.Team",
+        start_pos: tuple[int, int],
+        end_pos: tuple[int, int],
+    ) -> "checkersai.board.Move | None":
+        # Checking one move is cheaper than generating all of them.
+        move = checkersai.board.Move(team=team, start_pos=start_pos, end_pos=end_pos)
+        if not board._is_legal_step(move):
+            return None
+        if not move.is_capture:
+            for pos in tuple(board._pieces[team]):
+                for capture in board._reference_captures(pos):
+                    return None
+        return move
+
+    def perft(
+        self, board: "checkersai.board.Board", team: "checkersai.board.Team", depth: int
+    ) -> int:
+        return checkersai._core.perft(
+            list(board._cells),
+            board._cols,
+            board._rows,
+            team.value,
+            board._forced_index(team),
+            depth,
+        )
+
+
+class FlyingKingRules(Rules):
+    # Kings slide any distance and capture from a distance. Jumped pieces stay
+    # on the board until the turn ends, so they can't be jumped twice.
+    name = "flying"
+
+    # Capture directions for men, indexed by cell value.
+    man_captures = {1: ((-1, 1), (1, 1)), 2: ((-1, -1), (1, -1))}
+
+    def generate_moves(
+        self, board: "checkersai.board.Board", team: "checkersai.board.Team"
+    ):
+        cells = board._cells
+        cols = board._cols
+        rows = board._rows
+        pending = board._pending
+        forced = board._forced_index(team)
+        if forced >= 0:
+            origins = [forced]
+        else:
+            origins = [x + y * cols for x, y in board._pieces[team]]
+
+        captures = [
+            (start, end, jumped)
+            for start in origins
+            for end, jumped in self._captures(cells, cols, rows, start, pending)
+        ]
+        if captures:
+            captures = self._select_captures(cells, cols, rows, captures, pending)
+            return [
+                checkersai.board.Move(
+                    team=team,
+                    start_pos=(start % cols, start // cols),
+                    end_pos=(end % cols, end // cols),
+                    jump_pos=(jumped % cols, jumped // cols),
+                )
+                for start, end, jumped in captures
+            ]
+        if forced >= 0:
+            return []
+
+        moves = []
+        forward = team.direction
+        for start in origins:
+            x = start % cols
+            y = start // cols
+            if cells[start] >= WHITE_KING:
+                for dx, dy in DIRECTIONS:
+                    end_x = x + dx
+                    end_y = y + dy
+                    while (
+                        0 <= end_x < cols
+                        and 0 <= end_y < rows
+                        and cells[end_y * cols + end_x] == EMPTY
+                    ):
+                        moves.append((x, y, end_x, end_y))
+                        end_x += dx
+                        end_y += dy
+            else:
+                end_y = y + forward
+                for end_x in (x - 1, x + 1):
+                    if (
+                        0 <= end_x < cols
+                        and 0 <= end_y < rows
+                        and cells[end_y * cols + end_x] == EMPTY
+                    ):
+                        moves.append((x, y, end_x, end_y))
+        return [
+            checkersai.board.Move(
+                team=team,
+                start_pos=(x, y),
+                end_pos=(end_x, end_y),
+                jump_pos=None,
+            )
+            for x, y, end_x, end_y in moves
+        ]
+
+    def _captures(
+        self, cells: list[int], cols: int, rows: int, start: int, pending: tuple
+    ) -> list[tuple[int, int]]:
+        value = cells[start]
+        enemy = 1 - team_of(value)
+        x = start % cols
+        y = start // cols
+        captures = []
+        if value >= WHITE_KING:
+            for dx, dy in DIRECTIONS:
+                # Slide up to the first piece, then land on any empty square
+                # behind it.
+                cx = x + dx
+                cy = y + dy
+                while (
+                    0 <= cx < cols and 0 <= cy < rows and cells[cy * cols + cx] == EMPTY
+                ):
+                    cx += dx
+                    cy += dy
+                if not (0 <= cx < cols and 0 <= cy < rows):
+                    continue
+                jumped = cy * cols + cx
+                if team_of(cells[jumped]) != enemy or jumped in pending:
+                    continue
+                cx += dx
+                cy += dy
+                while (
+                    0 <= cx < cols and 0 <= cy < rows and cells[cy * cols + cx] == EMPTY
+                ):
+                    captures.append((cy * cols + cx, jumped))
+                    cx += dx
+                    cy += dy
+        else:
+            for dx, dy in self.man_captures[value]:
+                end_x = x + 2 * dx
+                end_y = y + 2 * dy
+                if 0 <= end_x < cols and 0 <= end_y < rows:
+                    end = end_y * cols + end_x
+                    jumped = (y + dy) * cols + x + dx
+                    if (
+                        cells[end] == EMPTY
+                        and team_of(cells[jumped]) == enemy
+                        and jumped not in pending
+                    ):
+                        captures.append((end, jumped))
+        return captures
+
+    def _select_captures(
+        self, cells: list[int], cols: int, rows: int, captures: list, pending: tuple
+    ) -> list:
+        return captures
+
+    def _promote(
+        self, value: "checkersai.board.BoardValue", end_y: int, rows: int
+    ) -> "tuple[checkersai.board.BoardValue, bool]":
+        # Returns the value after the move and whether promotion ends the turn.
+        if not value.king and end_y == (0 if value.team.direction == -1 else rows - 1):
+            return value.kinged, True
+        return value, False
+
+    def _finish_turn(
+        self, board: "checkersai.board.Board", end_pos: tuple[int, int]
+    ) -> None:
+        pass
+
+    def make(
+        self, board: "checkersai.board.Board", move: "checkersai.board.Move"
+    ) -> tuple:
+        cols = board._cols
+        value = board[move.start_pos]
+        undo = (board._pending, board._last_move, board._turn_continues)
+        board[move.start_pos] = checkersai.board.BoardValue.EMPTY
+        pending = board._pending
+        if move.jump_pos is not None:
+            pending += (move.jump_pos[1] * cols + move.jump_pos[0],)
+        end_value, stop = self._promote(value, move.end_pos[1], board._rows)
+        board[move.end_pos] = end_value
+        board._last_move = move
+
+        end = move.end_pos[1] * cols + move.end_pos[0]
+        removed = ()
+        if (
+            move.jump_pos is not None
+            and not stop
+            and self._captures(board._cells, cols, board._rows, end, pending)
+        ):
+            board._pending = pending
+            board._turn_continues = True
+        else:
+            removed = tuple(
+                ((index % cols, index // cols), board[index % cols, index // cols])
+                for index in pending
+            )
+            for pos, _ in removed:
+                board[pos] = checkersai.board.BoardValue.EMPTY
+            board._pending = ()
+            board._turn_continues = False
+            self._finish_turn(board, move.end_pos)
+        return (move, value, removed, *undo)
+
+    def unmake(self, board: "checkersai.board.Board", undo: tuple) -> None:
+        move, value, removed, pending, last_move, turn_continues = undo
+        for pos, removed_value in removed:
+            board[pos] = removed_value
+        board[move.end_pos] = checkersai.board.BoardValue.EMPTY
+        board[move.start_pos] = value
+        board._pending = pending
+        board._last_move = last_move
+        board._turn_continues = turn_continues
+
+
+class RussianRules(FlyingKingRules):
+    # Men capture backwards too, and a man reaching the far row mid-capture
+    # carries on jumping as a king.
+    name = "russian"
+
+    man_captures = {1: DIRECTIONS, 2: DIRECTIONS}
+
+    def _promote(
+        self, value: "checkersai.board.BoardValue", end_y: int, rows: int
+    ) -> "tuple[checkersai.board.BoardValue, bool]":
+        value, _ = super()._promote(value, end_y, rows)
+        return value, False
+
+
+class InternationalRules(FlyingKingRules):
+    # Men capture backwards, the longest capture sequence is mandatory, and a
+    # man is only promoted if its turn ends on the far row.
+    name = "international"
+    default_size = (10, 10)
+    start_rows = 4
+
+    man_captures = {1: DIRECTIONS, 2: DIRECTIONS}
+
+    def _promote(
+        self, value: "checkersai.board.BoardValue", end_y: int, rows: int
+    ) -> "tuple[checkersai.board.BoardValue, bool]":
+        return value, False
+
+    def _finish_turn(
+        self, board: "checkersai.board.Board", end_pos: tuple[int, int]
+    ) -> None:
+        value, _ = super()._promote(board[end_pos], end_pos[1], board.rows)
+        board[end_pos] = value
+
+    def _select_captures(
+        self, cells: list[int], cols: int, rows: int, captures: list, pending: tuple
+    ) -> list:
+        cells = list(cells)
+        lengths = []
+        for start, end, jumped in captures:
+            value = cells[start]
+            cells[start] = EMPTY
+            cells[end] = value
+            lengths.append(self._longest(cells, cols, rows, end, (*pending, jumped)))
+            cells[end] = EMPTY
+            cells[start] = value
+        longest = max(lengths)
+        return [
+            capture for capture, length in zip(captures, lengths) if length == longest
+        ]
+
+    def _longest(
+        self, cells: list[int], cols: int, rows: int, start: int, pending: tuple
+    ) -> int:
+        longest = 0
+        value = cells[start]
+        for end, jumped in self._captures(cells, cols, rows, start, pending):
+            cells[start] = EMPTY
+            cells[end] = value
+            length = 1 + self._longest(cells, cols, rows, end, (*pending, jumped))
+            cells[end] = EMPTY
+            cells[start] = value
+            longest = max(longest, length)
+        return longest
+
+
+variants = {
+    rules.name: rules
+    for rules in (
+        EnglishRules(),
+        FlyingKingRules(),
+        RussianRules(),
+        InternationalRules(),
+    )
+}
+
+
+def variant(name: str) -> Rules:
+    return variants[name]
@@ -0,0 +1,459 @@
+import array
+import dataclasses
+import math
+import time
+import typing
+
+import checkersai.board
+import checkersai.evaluation
+import checkersai.ordering
+
+WIN_SCORE = 1000.0
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+DEFAULT_HASH_MB = 16.0
+
+# Tables are keyed by the position hash, changed for black to move.
+_BLACK_KEY = 0x9E3779B97F4A7C15
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchInfo:
+    depth: int
+    score: float
+    nodes: int
+    seconds: float
+    tt_hit_rate: float
+    hash_usage: float
+    pv: tuple[checkersai.board.CompoundMove, ...]
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+
+def table_key(board: checkersai.board.Board, team: checkersai.board.Team) -> int:
+    if team is checkersai.board.Team.BLACK:
+        return board.position_hash ^ _BLACK_KEY
+    return board.position_hash
+
+
+def turn_code(turn: checkersai.board.CompoundMove | None) -> int:
+    # The start and end squares, a byte for each coordinate. Turns are never
+    # from (0, 0) to (0, 0), so 0 is free for no turn. Of multi-jumps that
+    # only differ on the way, the first one generated stands for them all.
+    if turn is None:
+        return 0
+    (start_x, start_y), (end_x, end_y) = turn.start_pos, turn.end_pos
+    return start_x | start_y << 8 | end_x << 16 | end_y << 24
+
+
+class TranspositionTable:
+    # One slot per key modulo the size, in flat arrays allocated up front, so
+    # the table never takes more memory than it starts with. A new entry
+    # replaces whatever is in its slot. Entries are (depth, score, bound,
+    # best turn), the turn packed by turn_code or 0 for none.
+    ENTRY_BYTES = 22
+
+    def __init__(self, entries: int = 1 << 20):
+        self.entries = entries
+        self.probes = 0
+        self.hits = 0
+        self._allocate()
+
+    @classmethod
+    def sized(cls, nbytes: int) -> "TranspositionTable":
+        return cls(max(nbytes // cls.ENTRY_BYTES, 1))
+
+    def __len__(self) -> int:
+        return self._used
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            len(column) * column.itemsize
+            for column in (
+                self._keys,
+                self._scores,
+                self._depths,
+                self._bounds,
+                self._moves,
+            )
+        )
+
+    @property
+    def usage(self) -> float:
+        return self._used / self.entries
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def get(self, key: int) -> tuple | None:
+        self.probes += 1
+        entry = self.peek(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def peek(self, key: int) -> tuple | None:
+        slot = key % self.entries
+        if self._keys[slot] != key:
+            return None
+        return (
+            self._depths[slot],
+            self._scores[slot],
+            self._bounds[slot],
+            self._moves[slot],
+        )
+
+    def put(self, key: int, depth: int, score: float, bound: int, move: int) -> None:
+        slot = key % self.entries
+        if self._keys[slot] == 0:
+            self._used += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._scores[slot] = score
+        self._bounds[slot] = bound
+        self._moves[slot] = move
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self) -> None:
+        self._allocate()
+        self.reset_stats()
+
+    def _allocate(self) -> None:
+        n = self.entries
+        self._keys = array.array("Q", [0]) * n
+        self._scores = array.array("d", [0]) * n
+        self._depths = array.array("b", [0]) * n
+        self._bounds = array.array("B", [0]) * n
+        self._moves = array.array("I", [0]) * n
+        self._used = 0
+
+
+class EvaluationCache:
+    # Static evaluations by key, laid out like TranspositionTable.
+    ENTRY_BYTES = 16
+
+    def __init__(self, entries: int = 1 << 18):
+        self.entries = entries
+        self._keys = array.array("Q", [0]) * entries
+        self._scores = array.array("d", [0]) * entries
+
+    @classmethod
+    def sized(cls, nbytes: int) -> "EvaluationCache":
+        return cls(max(nbytes // cls.ENTRY_BYTES, 1))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._keys) * 8 + len(self._scores) * 8
+
+    def get(self, key: int) -> float | None:
+        slot = key % self.entries
+        if self._keys[slot] != key:
+            return None
+        return self._scores[slot]
+
+    def put(self, key: int, score: float) -> None:
+        slot = key % self.entries
+        self._keys[slot] = key
+        self._scores[slot] = score
+
+
+class AlphaBeta:
+    def __init__(
+        self,
+        evaluator: checkersai.evaluation.IEvaluator,
+        depth: int,
+        *,
+        time_limit: float | None = None,
+        table: TranspositionTable | None = None,
+        ordering: checkersai.ordering.MoveOrdering | None = None,
+        quiescence: bool = True,
+        hash_mb: float = DEFAULT_HASH_MB,
+    ):
+        self._evaluator = evaluator
+        self._depth = depth
+        self.time_limit = time_limit
+        self._batched = evaluator.batched
+        self._deadline = None
+        # A quarter of the memory goes to evaluations, the rest to the table.
+        budget = int(hash_mb * (1 << 20))
+        if table is None:
+            table = TranspositionTable.sized(budget - budget // 4)
+        self.table = table
+        self.evaluations = EvaluationCache.sized(budget // 4)
+        self.ordering = (
+            checkersai.ordering.MoveOrdering() if ordering is None else ordering
+        )
+        self.quiescence = quiescence
+        self.nodes = 0
+        self.on_iteration: typing.Callable[[SearchInfo], None] | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes + self.evaluations.nbytes + self.ordering.nbytes
+
+    def search(
+        self, board: checkersai.board.Board, team: checkersai.board.Team
+    ) -> tuple[float, checkersai.board.CompoundMove | None]:
+        # Iterative deepening. Depth counts whole turns, so a multi-jump is
+        # searched as one move. Each iteration works on its own copy of the
+        # board, so running out of time can simply abandon it.
+        self.nodes = 0
+        self.table.reset_stats()
+        self.ordering.new_search(board)
+        start = time.perf_counter()
+        self._deadline = None
+        if self.time_limit is not None:
+            self._deadline = start + self.time_limit
+
+        score, best_turn = -math.inf, None
+        for depth in range(1, self._depth + 1):
+            try:
+                score, best_turn = self._root(board.copy(), team, depth)
+            except SearchTimeout:
+                break
+            if self.on_iteration is not None:
+                self.on_iteration(
+                    SearchInfo(
+                        depth=depth,
+                        score=score,
+                        nodes=self.nodes,
+                        seconds=time.perf_counter() - start,
+                        tt_hit_rate=self.table.hit_rate,
+                        hash_usage=self.table.usage,
+                        pv=self.principal_variation(board, team, depth),
+                    )
+                )
+            if abs(score) >= WIN_SCORE:
+                break
+            # The next iteration takes longer than all of the ones before, so
+            # it is unlikely to finish in what is left of the time.
+            if (
+                self._deadline is not None
+                and time.perf_counter() > start + self.time_limit / 2
+            ):
+                break
+        return score, best_turn
+
+    def principal_variation(
+        self, board: checkersai.board.Board, team: checkersai.board.Team, depth: int
+    ) -> tuple[checkersai.board.CompoundMove, ...]:
+        board = board.copy()
+        pv = []
+        seen = set()
+        while len(pv) < depth:
+            key = table_key(board, team)
+            entry = self.table.peek(key)
+            if entry is None or key in seen:
+                break
+            turn = _table_turn(list(board.possible_turns(team)), entry)
+            if turn is None:
+                break
+            seen.add(key)
+            pv.append(turn)
+            board.perform_compound_move(turn)
+            team = team.other
+        return tuple(pv)
+
+    def _root(
+        self, board: checkersai.board.Board, team: checkersai.board.Team, depth: int
+    ) -> tuple[float, checkersai.board.CompoundMove | None]:
+        # The first iteration always completes, so there is a move to play.
+        deadline = self._deadline
+        if depth == 1:
+            self._deadline = None
+        try:
+            key = table_key(board, team)
+            turns = list(board.possible_turns(team))
+            table_turn = _table_turn(turns, self.table.peek(key))
+            best_score = -math.inf
+            best_turn = None
+            for turn in self.ordering.order(turns, table_turn, 0):
+                undo = board.perform_compound_move(turn)
+                score = -self._negamax(
+                    board, team.other, depth - 1, 1, -math.inf, -best_score
+                )
+                board.undo_compound_move(undo)
+                if score > best_score:
+                    best_score = score
+                    best_turn = turn
+        finally:
+            self._deadline = deadline
+        self.table.put(key, depth, best_score, EXACT, turn_code(best_turn))
+        return best_score, best_turn
+
+    def _negamax(
+        self,
+        board: checkersai.board.Board,
+        team: checkersai.board.Team,
+        depth: int,
+        ply: int,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        self.nodes += 1
+        if (
+            self._deadline is not None
+            and self.nodes & 63 == 0
+            and time.perf_counter() > self._deadline
+        ):
+            raise SearchTimeout
+        if depth <= 0:
+            if self.quiescence:
+                return self._quiesce(board, team, ply, alpha, beta)
+            if not board.can_move(team):
+                return -WIN_SCORE
+            return self._evaluate(board, team)
+
+        key = table_key(board, team)
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, score, bound, _ = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score
+                elif bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        turns = list(board.possible_turns(team))
+        if not turns:
+            # Prefer quicker wins and slower losses.
+            return -WIN_SCORE - depth
+        if depth == 1 and self._batched:
+            return self._frontier(board, team, turns, key, ply)
+
+        original_alpha = alpha
+        best_score = -math.inf
+        best_turn = None
+        for turn in self.ordering.order(turns, _table_turn(turns, entry), ply):
+            undo = board.perform_compound_move(turn)
+            score = -self._negamax(board, team.other, depth - 1, ply + 1, -beta, -alpha)
+            board.undo_compound_move(undo)
+            if score > best_score:
+                best_score = score
+                best_turn = turn
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.ordering.cutoff(turn, depth, ply)
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.put(key, depth, best_score, bound, turn_code(best_turn))
+        return best_score
+
+    def _quiesce(
+        self,
+        board: checkersai.board.Board,
+        team: checkersai.board.Team,
+        ply: int,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        # Leaves are only scored once they are quiet. Captures are compulsory,
+        # so the side to move can only stand pat when it has none, and until
+        # then every capture is searched. Each one takes a piece, so this ends.
+        if not board.can_capture(team):
+            if not board.can_move(team):
+                return -WIN_SCORE
+            return self._evaluate(board, team)
+        best_score = -math.inf
+        for turn in self.ordering.order(list(board.possible_turns(team)), None, ply):
+            undo = board.perform_compound_move(turn)
+            self.nodes += 1
+            score = -self._quiesce(board, team.other, ply + 1, -beta, -alpha)
+            board.undo_compound_move(undo)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _frontier(
+        self,
+        board: checkersai.board.Board,
+        team: checkersai.board.Team,
+        turns: list[checkersai.board.CompoundMove],
+        key: int,
+        ply: int,
+    ) -> float:
+        # Scores every leaf below this node in one batch. That gives up the
+        # cutoffs at the last ply, which pays off for expensive evaluators.
+        # Leaves with captures pending are scored on their own by _quiesce.
+        other = team.other
+        prepared = []
+        leaves = []
+        for i, turn in enumerate(turns):
+            undo = board.perform_compound_move(turn)
+            if self.quiescence and board.can_capture(other):
+                prepared.append(
+                    self._quiesce(board, other, ply + 1, -math.inf, math.inf)
+                )
+            elif board.can_move(other):
+                leaf = table_key(board, other)
+                score = self.evaluations.get(leaf)
+                if score is None:
+                    leaves.append((i, leaf))
+                    score = self._evaluator.prepare(board, other)
+                prepared.append(score)
+            else:
+                prepared.append(-WIN_SCORE)
+            board.undo_compound_move(undo)
+        self.nodes += len(turns)
+        scores = self._evaluator.evaluate_prepared(prepared)
+        for i, leaf in leaves:
+            self.evaluations.put(leaf, scores[i])
+        scores = [-score for score in scores]
+        best = max(range(len(turns)), key=scores.__getitem__)
+        self.table.put(key, 1, scores[best], EXACT, turn_code(turns[best]))
+        return scores[best]
+
+    def _evaluate(
+        self, board: checkersai.board.Board, team: checkersai.board.Team
+    ) -> float:
+        key = table_key(board, team)
+        score = self.evaluations.get(key)
+        if score is None:
+            score = self._evaluator.evaluate(board, team)
+            self.evaluations.put(key, score)
+        return score
+
+
+def _table_turn(
+    turns: list[checkersai.board.CompoundMove], entry: tuple | None
+) -> checkersai.board.CompoundMove | None:
+    if entry is None or not entry[3]:
+        return None
+    for turn in turns:
+        if turn_code(turn) == entry[3]:
+            return turn
+    return None
+
+
+def format_turn(turn: checkersai.board.CompoundMove) -> str:
+    separator = "x" if turn.is_capture else "-"
+    return separator.join("%d,%d" % pos for pos in turn.path)
@@ -0,0 +1,122 @@
+import concurrent.futures
+import json
+import logging
+import random
+
+import checkersai.archive
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.rng
+import checkersai.rules
+import checkersai.search
+
+logger = logging.getLogger(__name__)
+
+_team_chars = {checkersai.board.Team.WHITE: "w", checkersai.board.Team.BLACK: "b"}
+
+
+def play_game(
+    seed: int,
+    *,
+    board_size: tuple[int, int],
+    variant: str = "english",
+    depth: int = 2,
+    weights: str | None = None,
+    network: str | None = None,
+    hash_mb: float = 2 * checkersai.search.DEFAULT_HASH_MB,
+    random_plies: int = 6,
+    max_turns_without_capture: int = 80,
+    snapshot_interval: int = 1,
+) -> dict:
+    # The first few turns are random so that games with the same engines
+    # still cover different positions. Each worker plays one game at a time,
+    # so its two engines split the memory for tables.
+    rng = random.Random(seed)
+    board = checkersai.board.Board(
+        size=board_size, rules=checkersai.rules.variant(variant)
+    )
+    players = {
+        team: checkersai.computeropponent.SearchOpponent(
+            team,
+            None,
+            depth=depth,
+            weights=weights,
+            network=network,
+            hash_mb=hash_mb / 2,
+        )
+        for team in checkersai.board.Team
+    }
+    team = checkersai.board.Team.WHITE
+    positions = []
+    teams = []
+    played = []
+    turns_without_capture = 0
+    result = None
+    while turns_without_capture < max_turns_without_capture:
+        turns = list(board.possible_turns(team))
+        if not turns:
+            result = team.other.name
+            break
+        if len(teams) % snapshot_interval == 0:
+            positions.append(board.to_string())
+        teams.append(_team_chars[team])
+        if len(teams) <= random_plies:
+            turn = rng.choice(turns)
+        else:
+            turn = players[team].next_move(checkersai.game.PlayerBoard(board))
+        board.perform_compound_move(turn)
+        played.append(checkersai.search.format_turn(turn))
+        if turn.is_capture:
+            turns_without_capture = 0
+        else:
+            turns_without_capture += 1
+        team = team.other
+    return {
+        "seed": seed,
+        "variant": variant,
+        "result": "DRAW" if result is None else result,
+        "teams": "".join(teams),
+        "positions": positions,
+        "snapshot_interval": snapshot_interval,
+        "turns": played,
+        "max_turns_without_capture": max_turns_without_capture,
+    }
+
+
+def write_games(
+    path: str,
+    games: int,
+    executor: concurrent.futures.Executor,
+    *,
+    seed: int = 0,
+    **kwargs,
+) -> None:
+    # Each game's seed comes from the master seed and its number, and games
+    # are appended in that order as they finish. The file is then the same
+    # however many workers play. An interrupted run keeps what it has.
+    archive = checkersai.archive.Archive(path)
+    futures = [
+        executor.submit(
+            play_game, checkersai.rng.derive_seed(seed, "selfplay", i), **kwargs
+        )
+        for i in range(games)
+    ]
+    for i, future in enumerate(futures):
+        record = future.result()
+        archive.append(record)
+        logger.info(
+            "Game %d/%d (seed %d): %s after %d turns.",
+            i + 1,
+            games,
+            record["seed"],
+            record["result"],
+            len(record["teams"]),
+        )
+
+
+def read_games(path: str):
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,459 @@
+import asyncio
+import concurrent.futures
+import datetime
+import logging
+import random
+import threading
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.rules
+
+logger = logging.getLogger(__name__)
+
+engines = {
+    "random": checkersai.computeropponent.RandomOpponent,
+    "search": checkersai.computeropponent.SearchOpponent,
+}
+
+# Engines made by each worker, kept so that a search engine allocates its
+# tables once and keeps what they learned from one move to the next.
+_local = threading.local()
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def search(
+    engine: str,
+    options: dict,
+    team: checkersai.board.Team,
+    board: checkersai.game.PlayerBoard,
+) -> checkersai.board.Move | checkersai.board.CompoundMove:
+    players = _local.__dict__.setdefault("players", {})
+    key = (engine, team, tuple(sorted(options.items())))
+    player = players.get(key)
+    if player is None:
+        player = engines[engine](team, None, **options)
+        players[key] = player
+    return player.next_move(board)
+
+
+def parse_move(words: list[str]) -> tuple[tuple[int, int], tuple[int, int]]:
+    try:
+        x1, y1, x2, y2 = (int(word) for word in words)
+    except ValueError as e:
+        raise ProtocolError("MOVE takes 4 integers.") from e
+    return (x1, y1), (x2, y2)
+
+
+class AsyncPlayer(checkersai.game.IPlayer):
+    def __init__(self, team: checkersai.board.Team):
+        self._team = team
+        self._start_pos = None
+        self._end_pos = None
+        self.ready = asyncio.Event()
+        self.resigned = False
+
+    @property
+    def team(self) -> checkersai.board.Team:
+        return self._team
+
+    @property
+    def selected_square(self) -> tuple[int, int] | None:
+        return self._start_pos
+
+    @property
+    def destination_square(self) -> tuple[int, int] | None:
+        return self._end_pos
+
+    def submit(self, start_pos: tuple[int, int], end_pos: tuple[int, int]) -> None:
+        self._start_pos = start_pos
+        self._end_pos = end_pos
+        self.ready.set()
+
+    def resign(self) -> None:
+        self.resigned = True
+        self.ready.set()
+
+    def on_turn_started(self, board: checkersai.game.PlayerBoard) -> None:
+        pass
+
+    def on_move_started(self, board: checkersai.game.PlayerBoard) -> None:
+        self._start_pos = None
+        self._end_pos = None
+
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
+        pass
+
+    def on_move_rejected(self) -> None:
+        self._start_pos = None
+        self._end_pos = None
+
+    def on_move_completed(self) -> None:
+        self._start_pos = None
+        self._end_pos = None
+
+    def on_turn_completed(self) -> None:
+        pass
+
+    def on_win(self) -> None:
+        pass
+
+    def on_loss(self) -> None:
+        pass
+
+    def on_draw(self) -> None:
+        pass
+
+
+class StreamPlayer(AsyncPlayer):
+    def __init__(self, team: checkersai.board.Team, writer: asyncio.StreamWriter):
+        super().__init__(team)
+        self._writer = writer
+        self._continue_from = None
+        self._forced_end = None
+
+    def send(self, *words) -> None:
+        if not self._writer.is_closing():
+            self._writer.write((" ".join(str(word) for word in words) + "\n").encode())
+
+    def on_turn_started(self, board: checkersai.game.PlayerBoard) -> None:
+        self._continue_from = None
+
+    def on_move_started(self, board: checkersai.game.PlayerBoard) -> None:
+        super().on_move_started(board)
+        self.send("BOARD", board.to_string())
+        if self._continue_from is None:
+            self.send("YOURMOVE")
+        else:
+            self.send("YOURMOVE", *self._continue_from)
+
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
+        self.send("FORCED", *move.start_pos, *move.end_pos)
+        self._forced_end = move.end_pos
+
+    def on_move_rejected(self) -> None:
+        super().on_move_rejected()
+        self.send("REJECTED")
+
+    def on_move_completed(self) -> None:
+        if self._forced_end is not None:
+            self._continue_from = self._forced_end
+            self._forced_end = None
+        else:
+            self._continue_from = self._end_pos
+        super().on_move_completed()
+
+    def on_turn_completed(self) -> None:
+        self._continue_from = None
+        self.send("WAIT")
+
+    def on_win(self) -> None:
+        self.send("WIN")
+
+    def on_loss(self) -> None:
+        self.send("LOSS")
+
+    def on_draw(self) -> None:
+        self.send("DRAW")
+
+    async def read_moves(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            # A client that went away may also show up as a reset connection,
+            # once the server has written to it.
+            try:
+                line = await reader.readline()
+            except ConnectionError:
+                break
+            if not line:
+                break
+            words = line.decode().split()
+            if not words:
+                continue
+            try:
+                if words[0] == "MOVE":
+                    self.submit(*parse_move(words[1:]))
+                elif words[0] == "RESIGN":
+                    break
+                else:
+                    raise ProtocolError("Unknown command %s." % words[0])
+            except ProtocolError as e:
+                self.send("ERROR", e)
+        self.resign()
+
+
+class EnginePlayer(AsyncPlayer):
+    def __init__(
+        self,
+        team: checkersai.board.Team,
+        engine: str,
+        executor: concurrent.futures.Executor,
+        options: dict | None = None,
+    ):
+        super().__init__(team)
+        self._engine = engine
+        self._executor = executor
+        self._options = {} if options is None else options
+        self._planned_moves = []
+
+    def on_move_started(self, board: checkersai.game.PlayerBoard) -> None:
+        super().on_move_started(board)
+        if self._planned_moves:
+            move = self._planned_moves.pop(0)
+            asyncio.get_running_loop().call_soon(
+                self.submit, move.start_pos, move.end_pos
+            )
+            return
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, search, self._engine, self._options, self.team, board
+        )
+        future.add_done_callback(self._on_search_done)
+
+    def _on_search_done(self, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            logger.error("Engine %s failed: %r", self._engine, future.exception())
+            self.resign()
+        else:
+            move = future.result()
+            if isinstance(move, checkersai.board.CompoundMove):
+                self._planned_moves = list(move.moves[1:])
+                move = move.moves[0]
+            self.submit(move.start_pos, move.end_pos)
+
+    def on_move_forced(self, move: checkersai.board.Move) -> None:
+        if self._planned_moves:
+            self._planned_moves.pop(0)
+
+    def on_turn_completed(self) -> None:
+        self._planned_moves = []
+
+    def on_move_rejected(self) -> None:
+        super().on_move_rejected()
+        logger.error("Engine %s played an illegal move.", self._engine)
+        self.resign()
+
+
+class GameServer:
+    def __init__(
+        self,
+        *,
+        board_size: tuple[int, int] = (8, 8),
+        max_turns_without_capture: int | None = 80,
+        rules: checkersai.rules.Rules | None = None,
+        executor: concurrent.futures.Executor | None = None,
+        auto_forced_moves: bool = False,
+        engine_options: dict[str, dict] | None = None,
+    ):
+        if rules is None:
+            rules = checkersai.rules.variants["english"]
+        self._game = checkersai.game.Game(
+            None,
+            datetime.timedelta(0),
+            board_size,
+            max_turns_without_capture,
+            rules,
+            auto_forced_moves=auto_forced_moves,
+        )
+        self._rules = rules
+        self._executor = executor
+        self._engine_options = {} if engine_options is None else engine_options
+        self._waiting = None
+        self._matches = set()
+
+    @property
+    def matches(self) -> int:
+        return len(self._matches)
+
+    async def play_match(
+        self, white: AsyncPlayer, black: AsyncPlayer
+    ) -> checkersai.game.GameData:
+        loop = asyncio.get_running_loop()
+        # One event per match, so that either player resigning wakes it up.
+        # The readers are already running, and a player may have resigned on
+        # its own event before this one replaced it.
+        white.ready = black.ready = ready = asyncio.Event()
+        if white.resigned or black.resigned:
+            ready.set()
+        data = self._game.new_game(white, black, checkersai.board.Team.WHITE)
+        while not data.game_over:
+            # Forced moves are played without waiting for anyone.
+            if data.forced_move is None:
+                await ready.wait()
+                ready.clear()
+            for participant in (white, black):
+                if participant.resigned:
+                    logger.info("%s resigned.", participant.team.name)
+                    data.game_over = True
+                    data.winner = participant.team.other
+            if data.game_over:
+                break
+            player = data.current_player
+            data.current_time = loop.time()
+            self._game.step(data)
+            if player.selected_square is not None:
+                player.on_move_rejected()
+        self._game.end_game(data)
+        return data
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            words = (await reader.readline()).decode().split()
+            if len(words) not in (1, 2) or words[0] != "PLAY":
+                writer.write(b"ERROR Expected PLAY [engine].\n")
+            elif len(words) == 2 and words[1] not in engines:
+                writer.write(
+                    (
+                        "ERROR Unknown engine. Choose from %s.\n" % " ".join(engines)
+                    ).encode()
+                )
+            elif len(words) == 2:
+                await self._play_engine(reader, writer, words[1])
+            else:
+                await self._play_human(reader, writer)
+        finally:
+            writer.close()
+
+    async def _play_engine(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, engine: str
+    ) -> None:
+        human = StreamPlayer(checkersai.board.Team.WHITE, writer)
+        computer = EnginePlayer(
+            checkersai.board.Team.BLACK,
+            engine,
+            self._executor,
+            self._engine_options.get(engine),
+        )
+        human.send("TEAM", human.team.name)
+        human.send("VARIANT", self._rules.name)
+        await self._run(human.read_moves(reader), self.play_match(human, computer))
+
+    async def _play_human(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if self._waiting is None:
+            opponent = asyncio.get_running_loop().create_future()
+            self._waiting = opponent
+            writer.write(b"WAITING\n")
+            try:
+                if not await self._wait_for_opponent(reader, writer, opponent):
+                    return
+                black_reader, black_writer, match_done = opponent.result()
+            finally:
+                if self._waiting is opponent:
+                    self._waiting = None
+            white = StreamPlayer(checkersai.board.Team.WHITE, writer)
+            black = StreamPlayer(checkersai.board.Team.BLACK, black_writer)
+            white.send("TEAM", white.team.name)
+            black.send("TEAM", black.team.name)
+            for player in (white, black):
+                player.send("VARIANT", self._rules.name)
+            try:
+                await self._run(
+                    white.read_moves(reader),
+                    black.read_moves(black_reader),
+                    self.play_match(white, black),
+                )
+            finally:
+                if not match_done.done():
+                    match_done.set_result(None)
+        else:
+            match_done = asyncio.get_running_loop().create_future()
+            self._waiting.set_result((reader, writer, match_done))
+            self._waiting = None
+            await match_done
+
+    async def _wait_for_opponent(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        opponent: asyncio.Future,
+    ) -> bool:
+        # Watches the waiting client, so that one that leaves isn't paired
+        # with the next to come. Once paired, leaving resigns the match.
+        while True:
+            line = asyncio.ensure_future(reader.readline())
+            try:
+                await asyncio.wait(
+                    (opponent, line), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                if not line.done():
+                    # The match reads from here next, and only one read may
+                    # wait at a time.
+                    line.cancel()
+                    await asyncio.wait((line,))
+            if line.cancelled():
+                return True
+            if line.exception() is not None or not line.result():
+                return opponent.done()
+            writer.write(b"ERROR Wait for an opponent.\n")
+            if opponent.done():
+                return True
+
+    async def _run(self, *coroutines) -> None:
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        match = tasks[-1]
+        self._matches.add(match)
+        try:
+            await match
+        finally:
+            self._matches.discard(match)
+            for task in tasks:
+                task.cancel()
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        # Port 0 picks a free port, which the server's sockets tell.
+        server = await asyncio.start_server(self.handle_client, host, port)
+        for sock in server.sockets:
+            logger.info("Serving on %s.", sock.getsockname())
+        return server
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+async def random_client(
+    host: str,
+    port: int,
+    engine: str | None = None,
+    rng: random.Random | None = None,
+) -> str:
+    if rng is None:
+        rng = random.Random()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(("PLAY %s\n" % (engine or "")).encode())
+    team = None
+    rules = None
+    board = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ProtocolError("Server closed the connection.")
+            words = line.decode().split()
+            if words[0] == "TEAM":
+                team = checkersai.board.Team[words[1]]
+            elif words[0] == "VARIANT":
+                rules = checkersai.rules.variant(words[1])
+            elif words[0] == "BOARD":
+                board = checkersai.board.Board.from_string(words[1], rules)
+            elif words[0] == "YOURMOVE":
+                moves = list(board.possible_moves(team))
+                if len(words) == 3:
+                    forced = (int(words[1]), int(words[2]))
+                    moves = [move for move in moves if move.start_pos == forced]
+                move = rng.choice(moves)
+                writer.write(b"MOVE %d %d %d %d\n" % (*move.start_pos, *move.end_pos))
+            elif words[0] in ("WIN", "LOSS", "DRAW"):
+                return words[0]
+            elif words[0] == "ERROR":
+                raise ProtocolError(" ".join(words[1:]))
+    finally:
+        writer.close()
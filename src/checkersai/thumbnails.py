@@ -0,0 +1,61 @@
+import concurrent.futures
+import logging
+import os
+
+import checkersai.archive
+import checkersai.graphics
+import checkersai.rng
+
+logger = logging.getLogger(__name__)
+
+# One renderer per size in each worker process, made on first use.
+_renderers = {}
+
+
+def _render_games(
+    path: str, directory: str, start: int, stop: int, size: int, seed: int
+) -> int:
+    renderer = _renderers.get(size)
+    if renderer is None:
+        renderer = checkersai.graphics.Thumbnails(
+            size=size, rng=checkersai.rng.stream(seed, "thumbnails")
+        )
+        _renderers[size] = renderer
+    archive = checkersai.archive.Archive(path)
+    for number in range(start, stop):
+        game = archive[number]
+        board, _ = checkersai.archive.position(game, len(game["turns"]))
+        renderer.save(board, os.path.join(directory, "game-%05d.png" % number))
+    return stop - start
+
+
+def write_thumbnails(
+    path: str,
+    directory: str,
+    executor: concurrent.futures.Executor,
+    *,
+    size: int = 256,
+    seed: int = 0,
+    chunk: int = 256,
+) -> int:
+    # The final position of every game, as game-<number>.png. Games are
+    # handed out in chunks, so that each worker sets up its renderer once.
+    archive = checkersai.archive.Archive(path)
+    os.makedirs(directory, exist_ok=True)
+    futures = [
+        executor.submit(
+            _render_games,
+            path,
+            directory,
+            start,
+            min(start + chunk, len(archive)),
+            size,
+            seed,
+        )
+        for start in range(0, len(archive), chunk)
+    ]
+    done = 0
+    for future in futures:
+        done += future.result()
+        logger.info("Rendered %d/%d games.", done, len(archive))
+    return done
@@ -0,0 +1,165 @@
+import collections
+import concurrent.futures
+import json
+import logging
+import os
+
+import numpy as np
+
+import checkersai.archive
+import checkersai.evaluation
+import checkersai.rng
+
+logger = logging.getLogger(__name__)
+
+# Each row of the feature cache is the features of one position, from the
+# side to move's point of view, followed by the result for that side.
+COLUMNS = len(checkersai.evaluation.FEATURES) + 1
+
+
+def positions(game: dict):
+    # Every recorded position with the side to move and its result: 1 for a
+    # win, 0 for a loss and 0.5 for a draw.
+    for board, team in checkersai.archive.positions(game):
+        if game["result"] == "DRAW":
+            target = 0.5
+        else:
+            target = 1.0 if game["result"] == team.name else 0.0
+        yield board, team, target
+
+
+def position_rows(game: dict) -> list[tuple[float, ...]]:
+    return [
+        (*checkersai.evaluation.features(board, team), target)
+        for board, team, target in positions(game)
+    ]
+
+
+def _extract_lines(lines: list[str], rows, columns: int) -> np.ndarray:
+    arrays = [row for line in lines for row in rows(json.loads(line))]
+    return np.asarray(arrays, dtype=np.float32).reshape(-1, columns)
+
+
+def _chunks(path: str, size: int):
+    chunk = []
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                chunk.append(line)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def extract(
+    data_path: str,
+    cache_path: str,
+    executor: concurrent.futures.Executor,
+    *,
+    rows=position_rows,
+    columns: int = COLUMNS,
+    chunk_games: int = 256,
+    max_pending: int = 16,
+) -> np.ndarray:
+    # Only a bounded number of chunks is in flight, so memory use doesn't
+    # grow with the size of the data set.
+    pending = collections.deque()
+    with open(cache_path, "wb") as out:
+        for chunk in _chunks(data_path, chunk_games):
+            pending.append(executor.submit(_extract_lines, chunk, rows, columns))
+            if len(pending) >= max_pending:
+                pending.popleft().result().tofile(out)
+        while pending:
+            pending.popleft().result().tofile(out)
+    return load_positions(cache_path, columns)
+
+
+def load_positions(cache_path: str, columns: int = COLUMNS) -> np.ndarray:
+    if os.path.getsize(cache_path) == 0:
+        raise ValueError("No positions in %s." % cache_path)
+    return np.memmap(cache_path, dtype=np.float32, mode="r").reshape(-1, columns)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def loss(data: np.ndarray, weights: np.ndarray, batch_size: int = 65536) -> float:
+    total = 0.0
+    for first in range(0, len(data), batch_size):
+        batch = np.asarray(data[first : first + batch_size], dtype=np.float64)
+        p = np.clip(_sigmoid(batch[:, :-1] @ weights), 1e-12, 1 - 1e-12)
+        y = batch[:, -1]
+        total -= np.sum(y * np.log(p) + (1 - y) * np.log(1 - p))
+    return total / len(data)
+
+
+def _train_shard(
+    cache_path: str,
+    start: int,
+    stop: int,
+    weights: np.ndarray,
+    batch_size: int,
+    learning_rate: float,
+    l2: float,
+    seed: int,
+) -> np.ndarray:
+    data = load_positions(cache_path)
+    weights = weights.copy()
+    starts = np.arange(start, stop, batch_size)
+    np.random.default_rng(seed).shuffle(starts)
+    for first in starts:
+        batch = np.asarray(data[first : min(first + batch_size, stop)], np.float64)
+        x = batch[:, :-1]
+        error = _sigmoid(x @ weights) - batch[:, -1]
+        weights -= learning_rate * (x.T @ error / len(batch) + l2 * weights)
+    return weights
+
+
+def fit(
+    cache_path: str,
+    executor: concurrent.futures.Executor,
+    *,
+    shards: int = 8,
+    epochs: int = 20,
+    batch_size: int = 1024,
+    learning_rate: float = 0.05,
+    l2: float = 1e-4,
+    initial: dict[str, float] | None = None,
+    seed: int = 0,
+) -> dict[str, float]:
+    # Texel-style logistic regression of the game result on the features.
+    # Every epoch mini-batch gradient descent runs over each shard of the
+    # cache, starting from the same weights, and the results are averaged.
+    # The shards don't depend on the number of workers, so neither do the
+    # weights.
+    if initial is None:
+        initial = checkersai.evaluation.DEFAULT_WEIGHTS
+    data = load_positions(cache_path)
+    weights = np.array(
+        [initial.get(name, 0.0) for name in checkersai.evaluation.FEATURES],
+        dtype=np.float64,
+    )
+    bounds = np.linspace(0, len(data), shards + 1).astype(int)
+    shards = [(int(a), int(b)) for a, b in zip(bounds, bounds[1:]) if b > a]
+    logger.info("%d positions, initial loss %.4f.", len(data), loss(data, weights))
+    for epoch in range(epochs):
+        futures = [
+            executor.submit(
+                _train_shard,
+                cache_path,
+                start,
+                stop,
+                weights,
+                batch_size,
+                learning_rate,
+                l2,
+                checkersai.rng.derive_seed(seed, "tune", epoch, i),
+            )
+            for i, (start, stop) in enumerate(shards)
+        ]
+        weights = np.mean([future.result() for future in futures], axis=0)
+        logger.info("Epoch %d: loss %.4f.", epoch + 1, loss(data, weights))
+    return dict(zip(checkersai.evaluation.FEATURES, weights.tolist()))
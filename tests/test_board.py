@@ -0,0 +1,27 @@
+import pytest
+
+import checkersai.board
+import checkersai.rules
+
+
+def _moves(board, team):
+    checkersai.board.move_cache.clear()
+    return [(move.start_pos, move.end_pos) for move in board.possible_moves(team)]
+
+
+@pytest.mark.parametrize("variant", sorted(checkersai.rules.variants))
+def test_move_order_depends_on_position_only(variant):
+    rules = checkersai.rules.variant(variant)
+    board = checkersai.board.Board(size=rules.default_size, rules=rules)
+    # The same position with its pieces added in the opposite order, as if
+    # it had been reached by a different sequence of moves.
+    other = board.copy()
+    pieces = list(board.pieces())
+    for pos, value in pieces:
+        other[pos] = checkersai.board.BoardValue.EMPTY
+    for pos, value in reversed(pieces):
+        other[pos] = value
+    assert other.position_hash == board.position_hash
+    assert list(other.pieces()) != list(board.pieces())
+    for team in checkersai.board.Team:
+        assert _moves(other, team) == _moves(board, team)
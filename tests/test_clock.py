@@ -0,0 +1,57 @@
+import datetime
+import random
+import time
+
+import pytest
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.rules
+
+STEP = 1 / 60
+
+
+def _play(game, white, black):
+    # Like Game._run without the sleeping: the game clock moves on by the
+    # time each step took, so thinking costs what it did, while the pauses
+    # between clicks pass without waiting for them.
+    start = time.perf_counter()
+    data = game.new_game(white, black, checkersai.board.Team.WHITE)
+    now = 0.0
+    while not data.game_over:
+        now += max(time.perf_counter() - start, STEP)
+        start = time.perf_counter()
+        data.current_time = now
+        game.step(data)
+    return data
+
+
+@pytest.mark.parametrize(
+    "player",
+    [
+        lambda team: checkersai.computeropponent.RandomOpponent(
+            team, None, rng=random.Random(team.value)
+        ),
+        lambda team: checkersai.computeropponent.SearchOpponent(
+            team, None, depth=20, hash_mb=1
+        ),
+    ],
+    ids=["random", "search"],
+)
+def test_clocked_game_does_not_run_out_of_time(player):
+    game = checkersai.game.Game(
+        None,
+        datetime.timedelta(seconds=STEP),
+        (8, 8),
+        40,
+        checkersai.rules.variant("english"),
+        (3.0, 0.1),
+    )
+    data = _play(
+        game,
+        player(checkersai.board.Team.WHITE),
+        player(checkersai.board.Team.BLACK),
+    )
+    for team in checkersai.board.Team:
+        assert not data.clock.flagged(team, data.current_time)
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+import checkersai._core
+import checkersai.board
+
+SIZES = [(8, 8), (10, 10), (7, 9), (12, 6)]
+SEEDS = range(3)
+
+
+def _positions(size, seed, plies=60):
+    # Every position of a seeded random game, including those part way
+    # through a multi-jump.
+    rng = random.Random(seed)
+    board = checkersai.board.Board(size=size)
+    team = checkersai.board.Team.WHITE
+    for _ in range(plies):
+        yield board, team
+        moves = list(board.possible_moves(team))
+        if not moves:
+            return
+        board.perform_move(rng.choice(moves))
+        if not board.turn_in_progress:
+            team = team.other
+
+
+def _reference_perft(board, team, depth):
+    if depth == 0:
+        return 1
+    moves = list(board._reference_moves(team))
+    if depth == 1:
+        return len(moves)
+    total = 0
+    for move in moves:
+        undo = board._make_step(move)
+        next_team = team if board.turn_in_progress else team.other
+        total += _reference_perft(board, next_team, depth - 1)
+        board._unmake_step(undo)
+    return total
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("size", SIZES)
+def test_generation_matches_reference(size, seed):
+    for board, _ in _positions(size, seed):
+        for team in checkersai.board.Team:
+            assert list(board._core_moves(team)) == list(board._reference_moves(team))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("size", SIZES)
+def test_make_unmake_matches_reference(size, seed):
+    cols, rows = size
+    for board, team in _positions(size, seed):
+        cells = list(board._cells)
+        text = board.to_string()
+        position_hash = board.position_hash
+        pieces = {team: dict(board._pieces[team]) for team in checkersai.board.Team}
+        for move in list(board._reference_moves(team)):
+            start = move.start_pos[1] * cols + move.start_pos[0]
+            end = move.end_pos[1] * cols + move.end_pos[0]
+            core_cells = list(cells)
+            core_undo = checkersai._core.make_move(core_cells, cols, rows, start, end)
+            continues = (
+                core_undo & 7 != checkersai._core.EMPTY
+                and not core_undo & 8
+                and checkersai._core.can_capture_from(core_cells, cols, rows, end)
+            )
+
+            undo = board._make_step(move)
+            assert board._cells == core_cells
+            assert board.turn_in_progress == continues
+
+            checkersai._core.unmake_move(core_cells, cols, start, end, core_undo)
+            board._unmake_step(undo)
+            assert core_cells == cells
+            assert board._cells == cells
+            assert board.to_string() == text
+            assert board.position_hash == position_hash
+            assert board._pieces == pieces
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("size", SIZES)
+def test_perft_matches_reference(size, seed):
+    cols, rows = size
+    for ply, (board, team) in enumerate(_positions(size, seed, plies=30)):
+        if ply % 10:
+            continue
+        assert checkersai._core.perft(
+            list(board._cells), cols, rows, team.value, board._forced_index(team), 3
+        ) == _reference_perft(board, team, 3)
+        assert board.perft(team, 3) == _reference_perft(board, team, 3)
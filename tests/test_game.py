@@ -0,0 +1,62 @@
+import concurrent.futures
+import datetime
+import random
+import sys
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+
+STEP = 1 / 60
+
+
+def test_headless_game_between_engines():
+    # Without graphics nothing draws frames, so the players only learn the
+    # time from the game's steps.
+    game = checkersai.game.Game(None, datetime.timedelta(seconds=STEP), (8, 8))
+    data = game.new_game(
+        checkersai.computeropponent.RandomOpponent(
+            checkersai.board.Team.WHITE, None, rng=random.Random(0)
+        ),
+        checkersai.computeropponent.RandomOpponent(
+            checkersai.board.Team.BLACK, None, rng=random.Random(1)
+        ),
+        checkersai.board.Team.WHITE,
+    )
+    steps = 0
+    while not data.game_over and steps < 100000:
+        steps += 1
+        data.current_time = steps * STEP
+        game.step(data)
+    assert data.game_over
+    assert data.winner is not None or data.turns_without_capture >= 80
+
+
+def test_snapshot_shared_between_threads():
+    rng = random.Random(0)
+    board = checkersai.board.Board(size=(10, 10))
+    team = checkersai.board.Team.WHITE
+    for _ in range(20):
+        board.perform_compound_move(rng.choice(list(board.possible_turns(team))))
+        team = team.other
+    snapshot = checkersai.game.PlayerBoard(board)
+    expected = list(board.possible_turns(team)), board.to_string()
+
+    def search(_):
+        results = []
+        for _ in range(200):
+            results.append((list(snapshot.possible_turns(team)), snapshot.to_string()))
+        return results
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            results = [
+                result
+                for thread_results in executor.map(search, range(4))
+                for result in thread_results
+            ]
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(result == expected for result in results)
@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+
+import checkersai.board
+import checkersai.network
+import checkersai.search
+
+
+def test_evaluator_caches_recent_results():
+    rng = random.Random(0)
+    board = checkersai.board.Board()
+    team = checkersai.board.Team.WHITE
+    positions = []
+    for _ in range(20):
+        positions.append((board.copy(), team))
+        turn = rng.choice(list(board.possible_turns(team)))
+        board.perform_compound_move(turn)
+        team = team.other
+
+    network = checkersai.network.ValueNetwork.create(
+        checkersai.network.planes(board, team).size, rng=np.random.default_rng(0)
+    )
+    calls = []
+    forward = network.forward
+    network.forward = lambda x: calls.append(len(x)) or forward(x)
+    evaluator = checkersai.network.NetworkEvaluator(network)
+
+    first = [evaluator.evaluate(board, team) for board, team in positions]
+    second = [evaluator.evaluate(board, team) for board, team in positions]
+    assert first == second
+    assert len(calls) == len(positions)
+    for (board, team), score in zip(positions, first):
+        planes = checkersai.network.planes(board, team)
+        assert score == forward(planes[np.newaxis]).tolist()[0]
+    # The cache stays the size it was made with, however much it sees.
+    assert (
+        evaluator._cache.nbytes == 4096 * checkersai.search.EvaluationCache.ENTRY_BYTES
+    )
@@ -0,0 +1,165 @@
+import asyncio
+import concurrent.futures
+import random
+
+import pytest
+
+import checkersai.board
+import checkersai.computeropponent
+import checkersai.game
+import checkersai.rules
+import checkersai.server
+
+HOST = "127.0.0.1"
+RESULTS = {"WIN": "LOSS", "LOSS": "WIN", "DRAW": "DRAW"}
+
+
+async def _with_server(variant, auto_forced_moves, play, **kwargs):
+    rules = checkersai.rules.variant(variant)
+    game_server = checkersai.server.GameServer(
+        board_size=rules.default_size,
+        rules=rules,
+        auto_forced_moves=auto_forced_moves,
+        **kwargs,
+    )
+    server = await game_server.start(HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        results = await asyncio.wait_for(play(port), timeout=120)
+        await asyncio.wait_for(_finished(game_server), timeout=5)
+    return results
+
+
+async def _finished(game_server):
+    while game_server.matches:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("auto_forced_moves", [False, True])
+@pytest.mark.parametrize("variant", ["english", "international"])
+@pytest.mark.parametrize("seed", range(3))
+def test_match_against_engine(variant, auto_forced_moves, seed):
+    async def play(port):
+        return await checkersai.server.random_client(
+            HOST, port, "random", random.Random(seed)
+        )
+
+    result = asyncio.run(_with_server(variant, auto_forced_moves, play))
+    assert result in RESULTS
+
+
+@pytest.mark.parametrize("variant", ["english", "international"])
+def test_match_against_search_in_worker_process(variant):
+    async def play(port):
+        return await checkersai.server.random_client(
+            HOST, port, "search", random.Random(0)
+        )
+
+    with concurrent.futures.ProcessPoolExecutor(1) as executor:
+        result = asyncio.run(
+            _with_server(
+                variant,
+                False,
+                play,
+                executor=executor,
+                engine_options={"search": {"depth": 2, "hash_mb": 1}},
+            )
+        )
+    assert result in RESULTS
+
+
+def test_engines_are_kept_between_moves(monkeypatch):
+    made = []
+
+    class Engine(checkersai.computeropponent.RandomOpponent):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            made.append(self)
+
+    monkeypatch.setitem(checkersai.server.engines, "counting", Engine)
+    board = checkersai.game.PlayerBoard(checkersai.board.Board())
+    for _ in range(3):
+        for team in checkersai.board.Team:
+            checkersai.server.search("counting", {}, team, board)
+    assert len(made) == 2
+
+
+@pytest.mark.parametrize("auto_forced_moves", [False, True])
+@pytest.mark.parametrize("variant", ["english", "international"])
+@pytest.mark.parametrize("seed", range(3))
+def test_match_between_clients(variant, auto_forced_moves, seed):
+    async def play(port):
+        return await asyncio.gather(
+            checkersai.server.random_client(HOST, port, rng=random.Random(seed)),
+            checkersai.server.random_client(HOST, port, rng=random.Random(seed + 1)),
+        )
+
+    first, second = asyncio.run(_with_server(variant, auto_forced_moves, play))
+    assert RESULTS[first] == second
+
+
+async def _leave(port, request, until=None):
+    # A client that asks for a match, reads up to a line starting with until
+    # and goes away.
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(request)
+    while until is not None:
+        line = await reader.readline()
+        if not line or line.startswith(until):
+            break
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _waiting(game_server, waiting=True):
+    while (game_server._waiting is not None) != waiting:
+        await asyncio.sleep(0.01)
+
+
+def test_client_leaving_before_engine_match():
+    async def play(port):
+        await _leave(port, b"PLAY random\n")
+
+    asyncio.run(_with_server("english", False, play))
+
+
+def test_client_leaving_while_waiting():
+    game_server = checkersai.server.GameServer()
+
+    async def main():
+        server = await game_server.start(HOST, 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await _leave(port, b"PLAY\n", until=b"WAITING")
+            await asyncio.wait_for(_waiting(game_server, False), timeout=5)
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    checkersai.server.random_client(HOST, port, rng=random.Random(0)),
+                    checkersai.server.random_client(HOST, port, rng=random.Random(1)),
+                ),
+                timeout=120,
+            )
+            await asyncio.wait_for(_finished(game_server), timeout=5)
+        return results
+
+    first, second = asyncio.run(main())
+    assert RESULTS[first] == second
+
+
+def test_opponent_leaving_during_match():
+    game_server = checkersai.server.GameServer()
+
+    async def main():
+        server = await game_server.start(HOST, 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            client = asyncio.ensure_future(
+                checkersai.server.random_client(HOST, port, rng=random.Random(0))
+            )
+            await asyncio.wait_for(_waiting(game_server), timeout=5)
+            await _leave(port, b"PLAY\n", until=b"TEAM")
+            result = await asyncio.wait_for(client, timeout=120)
+            await asyncio.wait_for(_finished(game_server), timeout=5)
+        return result
+
+    assert asyncio.run(main()) == "WIN"